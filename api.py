@@ -0,0 +1,271 @@
+import base64
+from datetime import datetime
+from functools import wraps
+from typing import List, Optional, Tuple
+
+import msgspec
+from flask import Blueprint, Response, request, session
+from sqlalchemy import or_, select, tuple_
+
+from models import db, Cliente, Produto, OrdemServico, ItemOS, OrdemServicoArquivo, ItemOSArquivo, normalizar_status
+from consultas import subtotal_da_linha
+
+api = Blueprint('api', __name__, url_prefix='/api')
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+# 📦 Estruturas de resposta (msgspec serializa direto, sem passar por dict)
+class OrdemResumo(msgspec.Struct, gc=False):
+    id: int
+    cliente_id: int
+    cliente_nome: str
+    data_criacao: Optional[datetime]
+    status: Optional[str]
+    subtotal: float
+    desconto: float
+    total: float
+
+
+class ItemDetalhe(msgspec.Struct, gc=False):
+    id: int
+    produto_id: int
+    produto_nome: str
+    descricao: Optional[str]
+    quantidade: int
+    preco_unitario: float
+    subtotal: float
+
+
+class OrdemDetalhe(msgspec.Struct):
+    id: int
+    cliente_id: int
+    cliente_nome: str
+    data_criacao: Optional[datetime]
+    status: Optional[str]
+    observacoes: Optional[str]
+    subtotal: float
+    desconto: float
+    total: float
+    itens: List[ItemDetalhe]
+
+
+class ClienteResumo(msgspec.Struct, gc=False):
+    id: int
+    nome: str
+    telefone: Optional[str]
+    email: Optional[str]
+    cpf_cnpj: str
+    cidade: Optional[str]
+
+
+class ProdutoResumo(msgspec.Struct, gc=False):
+    id: int
+    nome: str
+    descricao: Optional[str]
+    preco: float
+    tipo: str
+
+
+class Pagina(msgspec.Struct):
+    dados: list
+    proximo_cursor: Optional[str]
+
+
+class Erro(msgspec.Struct):
+    erro: str
+
+
+_encoder = msgspec.json.Encoder()
+
+
+def resposta_json(obj, status=200):
+    return Response(_encoder.encode(obj), status=status, mimetype='application/json')
+
+
+# 🔒 Mesma sessão do site, mas respondendo 401 em vez de redirecionar
+def api_login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'usuario_id' not in session:
+            return resposta_json(Erro('não autenticado'), 401)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+# 🔖 Cursor opaco: a chave de ordenação da última linha entregue
+def codificar_cursor(chave):
+    return base64.urlsafe_b64encode(msgspec.json.encode(chave)).decode().rstrip('=')
+
+
+# Chave (nome, id) das listagens ordenadas por nome
+ChaveNome = Tuple[str, int]
+
+
+def decodificar_cursor(cursor, tipo):
+    """Chave do cursor validada contra tipo (msgspec é estrito), ou None se não bater."""
+    try:
+        return msgspec.json.decode(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)), type=tipo)
+    except (ValueError, msgspec.DecodeError):
+        return None
+
+
+def limite_pedido():
+    limite = request.args.get('limite', LIMITE_PADRAO, type=int)
+    return max(1, min(limite, LIMITE_MAXIMO))
+
+
+def paginar(linhas, limite, chave):
+    # Busca limite + 1 linhas para saber se existe próxima página sem um COUNT
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = codificar_cursor(chave(linhas[-1]))
+    return linhas, proximo
+
+
+def montar_ordem(id, cliente_id, cliente_nome, data_criacao, status, desconto, subtotal):
+    subtotal = round(subtotal or 0.0, 2)
+    desconto = desconto or 0.0
+    return OrdemResumo(
+        id, cliente_id, cliente_nome, data_criacao, status,
+        subtotal, desconto, max(subtotal - desconto, 0.0)
+    )
+
+
+# 📋 Ordens com filtros: ?status=&cliente_id=&mes=&ano=&cursor=&limite=
+@api.route('/ordens')
+@api_login_required
+def listar_ordens():
+    limite = limite_pedido()
+
+    # Subtotal correlacionado: só é somado para as limite + 1 linhas da página
+    consulta = (
+        select(
+            OrdemServico.id, OrdemServico.cliente_id, Cliente.nome,
+            OrdemServico.data_criacao, OrdemServico.status,
+            OrdemServico.desconto, subtotal_da_linha(),
+        )
+        .join(Cliente, Cliente.id == OrdemServico.cliente_id)
+    )
+
+    if request.args.get('status', '').strip():
+        status = normalizar_status(request.args['status'])
+        if status is None:
+            return resposta_json(Erro('status inválido'), 400)
+        consulta = consulta.where(OrdemServico.status == status)
+    cliente_id = request.args.get('cliente_id', type=int)
+    if cliente_id:
+        consulta = consulta.where(OrdemServico.cliente_id == cliente_id)
+    mes = request.args.get('mes', type=int)
+    if mes and 1 <= mes <= 12:
+        consulta = consulta.where(db.extract('month', OrdemServico.data_criacao) == mes)
+    ano = request.args.get('ano', type=int)
+    if ano:
+        consulta = consulta.where(db.extract('year', OrdemServico.data_criacao) == ano)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        ultimo_id = decodificar_cursor(cursor, int)
+        if ultimo_id is None:
+            return resposta_json(Erro('cursor inválido'), 400)
+        consulta = consulta.where(OrdemServico.id < ultimo_id)
+
+    linhas = db.session.execute(consulta.order_by(OrdemServico.id.desc()).limit(limite + 1)).all()
+    linhas, proximo = paginar(linhas, limite, lambda l: l.id)
+    return resposta_json(Pagina([montar_ordem(*l) for l in linhas], proximo))
+
+
+# 👁️ Ordem com itens (a arquivada só é procurada quando não está nas tabelas vivas)
+@api.route('/ordens/<int:os_id>')
+@api_login_required
+def detalhar_ordem(os_id):
+    for modelo, item_modelo in ((OrdemServico, ItemOS), (OrdemServicoArquivo, ItemOSArquivo)):
+        ordem = db.session.execute(
+            select(
+                modelo.id, modelo.cliente_id, Cliente.nome,
+                modelo.data_criacao, modelo.status,
+                modelo.observacoes, modelo.desconto,
+            )
+            .join(Cliente, Cliente.id == modelo.cliente_id)
+            .where(modelo.id == os_id)
+        ).first()
+        if ordem is not None:
+            break
+    else:
+        return resposta_json(Erro('ordem não encontrada'), 404)
+
+    itens = [
+        ItemDetalhe(id, produto_id, nome, descricao, quantidade, preco, round(quantidade * preco, 2))
+        for id, produto_id, nome, descricao, quantidade, preco in db.session.execute(
+            select(
+                item_modelo.id, item_modelo.produto_id, Produto.nome, Produto.descricao,
+                item_modelo.quantidade, Produto.preco,
+            )
+            .join(Produto, Produto.id == item_modelo.produto_id)
+            .where(item_modelo.os_id == os_id)
+            .order_by(item_modelo.id)
+        )
+    ]
+    subtotal = round(sum(item.subtotal for item in itens), 2)
+    desconto = ordem.desconto or 0.0
+    return resposta_json(OrdemDetalhe(
+        ordem.id, ordem.cliente_id, ordem.nome, ordem.data_criacao, ordem.status,
+        ordem.observacoes, subtotal, desconto, max(subtotal - desconto, 0.0), itens
+    ))
+
+
+# 👥 Clientes com busca: ?busca=&cursor=&limite=
+@api.route('/clientes')
+@api_login_required
+def listar_clientes():
+    limite = limite_pedido()
+    consulta = select(
+        Cliente.id, Cliente.nome, Cliente.telefone, Cliente.email, Cliente.cpf_cnpj, Cliente.cidade
+    )
+
+    termo = request.args.get('busca', '').strip()
+    if termo:
+        consulta = consulta.where(or_(
+            Cliente.nome.ilike(f'%{termo}%'),
+            Cliente.cpf_cnpj.ilike(f'%{termo}%'),
+            Cliente.email.ilike(f'%{termo}%')
+        ))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        chave = decodificar_cursor(cursor, ChaveNome)
+        if chave is None:
+            return resposta_json(Erro('cursor inválido'), 400)
+        consulta = consulta.where(tuple_(Cliente.nome, Cliente.id) > chave)
+
+    linhas = db.session.execute(consulta.order_by(Cliente.nome, Cliente.id).limit(limite + 1)).all()
+    linhas, proximo = paginar(linhas, limite, lambda l: [l.nome, l.id])
+    return resposta_json(Pagina([ClienteResumo(*l) for l in linhas], proximo))
+
+
+# 📦 Catálogo: ?busca=&tipo=&cursor=&limite=
+@api.route('/produtos')
+@api_login_required
+def listar_produtos():
+    limite = limite_pedido()
+    consulta = select(Produto.id, Produto.nome, Produto.descricao, Produto.preco, Produto.tipo)
+
+    termo = request.args.get('busca', '').strip()
+    if termo:
+        consulta = consulta.where(Produto.nome.ilike(f'%{termo}%'))
+    tipo = request.args.get('tipo', '').strip()
+    if tipo:
+        consulta = consulta.where(Produto.tipo.ilike(tipo))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        chave = decodificar_cursor(cursor, ChaveNome)
+        if chave is None:
+            return resposta_json(Erro('cursor inválido'), 400)
+        consulta = consulta.where(tuple_(Produto.nome, Produto.id) > chave)
+
+    linhas = db.session.execute(consulta.order_by(Produto.nome, Produto.id).limit(limite + 1)).all()
+    linhas, proximo = paginar(linhas, limite, lambda l: [l.nome, l.id])
+    return resposta_json(Pagina([ProdutoResumo(*l) for l in linhas], proximo))
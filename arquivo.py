@@ -0,0 +1,119 @@
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import abort
+from flask.cli import with_appcontext
+from sqlalchemy import DateTime, delete, exists, func, insert, literal, select
+
+from config import env_int
+from models import db, ItemOS, ItemOSArquivo, OrdemServico, OrdemServicoArquivo, STATUS_CANCELADA, STATUS_PAGO
+
+# 🗄️ OS encerradas há mais de um ano quase nunca são abertas: vão para as
+# tabelas *_arquivo, com o mesmo id, e saem das buscas e do dashboard.
+STATUS_ARQUIVAVEIS = (STATUS_PAGO, STATUS_CANCELADA)
+IDADE_ARQUIVO_DIAS = env_int('ARQUIVO_IDADE_DIAS', 365)
+
+
+def corte_arquivo(dias=None):
+    return datetime.utcnow() - timedelta(days=IDADE_ARQUIVO_DIAS if dias is None else dias)
+
+
+# 🔎 OS viva ou arquivada pelo id — para as telas que abrem uma OS específica
+def buscar_ordem(os_id):
+    ordem = db.session.get(OrdemServico, os_id) or db.session.get(OrdemServicoArquivo, os_id)
+    if ordem is None:
+        abort(404)
+    return ordem
+
+
+# 📅 O arquivo tem OS criadas no período? Decide pelo que foi de fato
+# arquivado (índice em data_criacao), não pela idade padrão: o
+# "arquivar-ordens --dias N" pode ter ido além dela.
+def arquivo_tem_periodo(inicio, fim):
+    return db.session.execute(
+        select(exists().where(
+            OrdemServicoArquivo.data_criacao >= inicio,
+            OrdemServicoArquivo.data_criacao < fim,
+        ))
+    ).scalar()
+
+
+def _candidatas(antes_de, lote):
+    ordens, itens = OrdemServico.__table__, ItemOS.__table__
+    # O SQLite reaproveita max(id) + 1 quando a última linha é apagada: a OS e
+    # o item de maior id ficam sempre nas tabelas vivas, para nenhum id novo
+    # colidir com um id já arquivado.
+    maior_os = select(func.max(ordens.c.id)).scalar_subquery()
+    maior_item = select(func.max(itens.c.id)).scalar_subquery()
+    return db.session.scalars(
+        select(ordens.c.id)
+        .where(
+            ordens.c.status.in_(STATUS_ARQUIVAVEIS),
+            ordens.c.data_criacao < antes_de,
+            ordens.c.id < maior_os,
+            ~exists().where(itens.c.os_id == ordens.c.id, itens.c.id == maior_item),
+        )
+        .order_by(ordens.c.id)
+        .limit(lote)
+    ).all()
+
+
+def arquivar_ordens(antes_de, lote=500, log=print):
+    ordens, itens = OrdemServico.__table__, ItemOS.__table__
+    ordens_arq, itens_arq = OrdemServicoArquivo.__table__, ItemOSArquivo.__table__
+    colunas_os = [c.name for c in ordens.c]
+    colunas_itens = [c.name for c in itens.c]
+
+    total_os = total_itens = 0
+    while True:
+        ids = _candidatas(antes_de, lote)
+        if not ids:
+            break
+
+        inicio = time.perf_counter()
+        # Cada lote numa transação: copia OS e itens (INSERT ... SELECT) e
+        # só então apaga das tabelas vivas
+        db.session.execute(insert(ordens_arq).from_select(
+            colunas_os + ['arquivado_em'],
+            select(*[ordens.c[n] for n in colunas_os], literal(datetime.utcnow(), DateTime))
+            .where(ordens.c.id.in_(ids))
+        ))
+        movidos = db.session.execute(insert(itens_arq).from_select(
+            colunas_itens,
+            select(*[itens.c[n] for n in colunas_itens]).where(itens.c.os_id.in_(ids))
+        )).rowcount
+        db.session.execute(delete(itens).where(itens.c.os_id.in_(ids)))
+        db.session.execute(delete(ordens).where(ordens.c.id.in_(ids)))
+        db.session.commit()
+
+        total_os += len(ids)
+        total_itens += movidos
+        log(f"📦 {len(ids)} OS / {movidos} itens arquivados em {time.perf_counter() - inicio:.2f}s (até OS #{ids[-1]})")
+
+    return total_os, total_itens
+
+
+def contar_arquivaveis(antes_de):
+    return db.session.execute(
+        select(func.count(OrdemServico.id)).where(
+            OrdemServico.status.in_(STATUS_ARQUIVAVEIS),
+            OrdemServico.data_criacao < antes_de,
+        )
+    ).scalar_one()
+
+
+# 🧹 flask arquivar-ordens — rodar periodicamente (cron / job agendado)
+@click.command('arquivar-ordens')
+@click.option('--dias', default=IDADE_ARQUIVO_DIAS, show_default=True, help='Idade mínima da OS, em dias.')
+@click.option('--lote', default=500, show_default=True, help='OS por transação.')
+@click.option('--simular', is_flag=True, help='Só conta as OS que seriam arquivadas.')
+@with_appcontext
+def arquivar_ordens_cmd(dias, lote, simular):
+    """Move OS pagas/canceladas antigas (e seus itens) para as tabelas de arquivo, mantendo os ids."""
+    antes_de = corte_arquivo(dias)
+    if simular:
+        click.echo(f"{contar_arquivaveis(antes_de)} OS seriam arquivadas (criadas antes de {antes_de:%d/%m/%Y}).")
+        return
+    total_os, total_itens = arquivar_ordens(antes_de, lote=lote, log=click.echo)
+    click.echo(f"Arquivamento concluído: {total_os} OS e {total_itens} itens.")
@@ -0,0 +1,253 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import urllib.request
+
+import click
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+from flask.cli import with_appcontext
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele só os .gz são gerados
+    brotli = None
+
+# 📦 Arquivos de terceiros servidos localmente (antes vinham do jsdelivr)
+VENDOR = {
+    'vendor/bootstrap/bootstrap.min.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons/bootstrap-icons.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/bootstrap-icons.css',
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff2':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/fonts/bootstrap-icons.woff2',
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/fonts/bootstrap-icons.woff',
+}
+
+# 🖼️ Logos redimensionados para onde são usados: o PDF da OS (os_pdf.html).
+# Só PNG — o xhtml2pdf não lê WebP.
+LOGOS = {'logo1.png': (240,)}
+
+COMPRIMIVEIS = ('.css', '.js', '.svg', '.json', '.txt')
+TAMANHO_MINIMO_COMPRESSAO = 512
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+PASTA_DIST = 'dist'
+
+mimetypes.add_type('font/woff2', '.woff2')
+mimetypes.add_type('font/woff', '.woff')
+
+assets = Blueprint('assets', __name__)
+
+_manifesto = None
+
+
+def _pasta_static():
+    return current_app.static_folder
+
+
+def _pasta_dist():
+    return os.path.join(_pasta_static(), PASTA_DIST)
+
+
+def carregar_manifesto():
+    global _manifesto
+    if _manifesto is None:
+        caminho = os.path.join(_pasta_dist(), 'manifest.json')
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                _manifesto = json.load(f)
+        except FileNotFoundError:
+            _manifesto = {}
+    return _manifesto
+
+
+def _nome_variante(nome, largura=None):
+    base, ext = os.path.splitext(nome)
+    return f'{base}-{largura}w{ext}' if largura else nome
+
+
+# 🔗 Usado nos templates no lugar de url_for('static', ...): devolve o arquivo
+# com hash (cache imutável) quando o build existe; senão o arquivo em static/
+# ou, para os vendorizados ainda não baixados, o próprio CDN.
+def asset_url(nome, largura=None):
+    variante = _nome_variante(nome, largura)
+    manifesto = carregar_manifesto()
+    if variante in manifesto:
+        return url_for('assets.servir_asset', filename=manifesto[variante])
+    if nome in manifesto:
+        return url_for('assets.servir_asset', filename=manifesto[nome])
+    if nome in VENDOR and not os.path.exists(os.path.join(_pasta_static(), nome)):
+        return VENDOR[nome]
+    return url_for('static', filename=nome)
+
+
+# 📄 Caminho no disco, para o xhtml2pdf ler o arquivo direto em vez de
+# fazer uma requisição HTTP ao próprio servidor.
+def asset_path(nome, largura=None):
+    variante = _nome_variante(nome, largura)
+    manifesto = carregar_manifesto()
+    if variante in manifesto:
+        return os.path.join(_pasta_dist(), manifesto[variante])
+    return os.path.join(_pasta_static(), nome)
+
+
+@assets.route('/assets/<path:filename>')
+def servir_asset(filename):
+    pasta = _pasta_dist()
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    aceitas = request.accept_encodings
+
+    # Serve a versão pré-comprimida quando o navegador aceita
+    for codificacao, ext in (('br', '.br'), ('gzip', '.gz')):
+        if aceitas[codificacao] and os.path.isfile(os.path.join(pasta, filename + ext)):
+            resposta = send_from_directory(pasta, filename + ext, mimetype=mimetype, max_age=31536000)
+            resposta.headers['Content-Encoding'] = codificacao
+            break
+    else:
+        resposta = send_from_directory(pasta, filename, mimetype=mimetype, max_age=31536000)
+
+    resposta.headers['Cache-Control'] = CACHE_IMUTAVEL
+    resposta.vary.add('Accept-Encoding')
+    return resposta
+
+
+# 🛠️ Build
+def _hash(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()[:10]
+
+
+def _baixar_vendor(static, log):
+    for nome, url in VENDOR.items():
+        destino = os.path.join(static, nome)
+        if os.path.exists(destino):
+            continue
+        pasta = os.path.dirname(destino)
+        os.makedirs(pasta, exist_ok=True)
+        log(f'⬇️  {url}')
+        # Baixa num temporário ao lado e só renomeia completo: um download
+        # interrompido não pode ficar no lugar (seria servido como imutável)
+        fd, temporario = tempfile.mkstemp(dir=pasta, prefix='.baixando-')
+        try:
+            with urllib.request.urlopen(url, timeout=30) as resposta, os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(resposta, f)
+                esperado = resposta.headers.get('Content-Length')
+                if esperado is not None and f.tell() != int(esperado):
+                    raise OSError(f'download incompleto de {url}: {f.tell()} de {esperado} bytes')
+            os.replace(temporario, destino)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+
+def _gerar_logos(static, log):
+    from PIL import Image
+
+    gerados = {}
+    for nome, larguras in LOGOS.items():
+        origem = os.path.join(static, nome)
+        if not os.path.exists(origem):
+            continue
+        with Image.open(origem) as imagem:
+            imagem.load()
+            for largura in larguras:
+                if largura < imagem.width:
+                    altura = round(imagem.height * largura / imagem.width)
+                    img = imagem.resize((largura, altura), Image.LANCZOS)
+                    gerados[_nome_variante(nome, largura)] = _salvar_imagem(img, 'PNG', optimize=True)
+        log(f'🖼️  {nome}: {len(larguras)} largura(s)')
+    return gerados
+
+
+def _salvar_imagem(img, formato, **opcoes):
+    from io import BytesIO
+
+    buffer = BytesIO()
+    img.save(buffer, formato, **opcoes)
+    return buffer.getvalue()
+
+
+def _reescrever_urls_css(conteudo, nome_css, manifesto):
+    pasta_css = os.path.dirname(nome_css)
+
+    def trocar(m):
+        aspas, alvo = m.group(1), m.group(2)
+        if alvo.startswith(('data:', 'http:', 'https:', '//')):
+            return m.group(0)
+        caminho = alvo.split('?')[0].split('#')[0]
+        chave = os.path.normpath(os.path.join(pasta_css, caminho)).replace(os.sep, '/')
+        if chave not in manifesto:
+            return m.group(0)
+        relativo = os.path.relpath(manifesto[chave], pasta_css).replace(os.sep, '/')
+        return f'url({aspas}./{relativo}{aspas})'
+
+    texto = conteudo.decode('utf-8')
+    return re.sub(r'url\((["\']?)([^"\')]+)\1\)', trocar, texto).encode('utf-8')
+
+
+def _gravar(dist, nome, conteudo, manifesto):
+    base, ext = os.path.splitext(nome)
+    com_hash = f'{base}.{_hash(conteudo)}{ext}'
+    destino = os.path.join(dist, com_hash)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, 'wb') as f:
+        f.write(conteudo)
+
+    if ext in COMPRIMIVEIS and len(conteudo) >= TAMANHO_MINIMO_COMPRESSAO:
+        with open(destino + '.gz', 'wb') as f:
+            f.write(gzip.compress(conteudo, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(destino + '.br', 'wb') as f:
+                f.write(brotli.compress(conteudo, quality=11))
+
+    manifesto[nome] = com_hash
+
+
+def construir_assets(baixar=True, log=print):
+    static = _pasta_static()
+    dist = _pasta_dist()
+    if baixar:
+        _baixar_vendor(static, log)
+
+    shutil.rmtree(dist, ignore_errors=True)
+    os.makedirs(dist)
+
+    arquivos = {}
+    for raiz, pastas, nomes in os.walk(static):
+        pastas[:] = [p for p in pastas if os.path.join(raiz, p) != dist]
+        for nome in nomes:
+            caminho = os.path.join(raiz, nome)
+            with open(caminho, 'rb') as f:
+                arquivos[os.path.relpath(caminho, static).replace(os.sep, '/')] = f.read()
+    arquivos.update(_gerar_logos(static, log))
+
+    # CSS por último: as url() apontam para fontes/imagens já com hash
+    manifesto = {}
+    for nome in sorted(arquivos, key=lambda n: n.endswith('.css')):
+        conteudo = arquivos[nome]
+        if nome.endswith('.css'):
+            conteudo = _reescrever_urls_css(conteudo, nome, manifesto)
+        _gravar(dist, nome, conteudo, manifesto)
+
+    with open(os.path.join(dist, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, sort_keys=True)
+
+    global _manifesto
+    _manifesto = None
+    log(f'✅ {len(manifesto)} arquivos em {dist}' + ('' if brotli else ' (sem brotli: só .gz)'))
+    return manifesto
+
+
+# 🏗️ flask assets — rodar no build/deploy, antes de subir o gunicorn
+@click.command('assets')
+@click.option('--sem-download', is_flag=True, help='Não baixa os arquivos de vendor ausentes.')
+@with_appcontext
+def construir_assets_cmd(sem_download):
+    """Vendoriza Bootstrap/ícones e gera static/dist com hash, .gz/.br e o logo do PDF redimensionado."""
+    construir_assets(baixar=not sem_download, log=click.echo)
@@ -0,0 +1,91 @@
+"""Compara a API msgspec (/api/ordens) com um jsonify ingênuo de objetos ORM.
+
+Uso: python benchmarks/bench_api_json.py [--ordens 5000] [--limite 200] [--rodadas 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def cronometrar(fn, rodadas):
+    fn()  # aquecimento
+    tempos = []
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ordens', type=int, default=5000)
+    parser.add_argument('--limite', type=int, default=200)
+    parser.add_argument('--rodadas', type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.chdir(tmp)  # sessões do Flask-Session vão para o diretório temporário
+
+    import msgspec
+    from flask import jsonify
+    from app import app
+    from api import montar_ordem, _encoder
+    from models import OrdemServico
+    from semente import semear
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+
+    # Versão ingênua: entidades completas + lazy loads + dict + jsonify
+    def ordens_jsonify():
+        ordens = OrdemServico.query.order_by(OrdemServico.id.desc()).limit(args.limite).all()
+        return jsonify([{
+            'id': o.id, 'cliente_id': o.cliente_id, 'cliente_nome': o.cliente.nome,
+            'data_criacao': o.data_criacao, 'status': o.status,
+            'desconto': o.desconto or 0.0, 'total': max(o.total, 0.0),
+        } for o in ordens])
+
+    app.add_url_rule('/bench/ordens_jsonify', view_func=ordens_jsonify)
+
+    with app.app_context():
+        semear(ordens=args.ordens)
+
+    cliente = app.test_client()
+    cliente.post('/login', data={'username': 'admin', 'senha': 'admin'})
+
+    url_api = f'/api/ordens?limite={args.limite}'
+    tamanho_api = len(cliente.get(url_api).data)
+    tamanho_naive = len(cliente.get('/bench/ordens_jsonify').data)
+
+    ms_api = cronometrar(lambda: cliente.get(url_api), args.rodadas)
+    ms_naive = cronometrar(lambda: cliente.get('/bench/ordens_jsonify'), args.rodadas)
+
+    # Só a serialização, com os mesmos dados já em memória
+    with app.test_request_context():
+        structs = msgspec.json.decode(cliente.get(url_api).data)['dados']
+        dicts = [dict(d) for d in structs]
+        structs = [montar_ordem(
+            d['id'], d['cliente_id'], d['cliente_nome'], d['data_criacao'],
+            d['status'], d['desconto'], d['subtotal'],
+        ) for d in structs]
+        ms_enc_msgspec = cronometrar(lambda: _encoder.encode(structs), args.rodadas * 10)
+        ms_enc_jsonify = cronometrar(lambda: jsonify(dicts).get_data(), args.rodadas * 10)
+
+    print(f"{args.ordens} ordens no banco, páginas de {args.limite} — mediana de {args.rodadas} rodadas")
+    print(f"  requisição completa   jsonify ORM: {ms_naive:8.2f} ms ({tamanho_naive} bytes)")
+    print(f"  requisição completa   msgspec API: {ms_api:8.2f} ms ({tamanho_api} bytes)"
+          f"  → {ms_naive / ms_api:.1f}x")
+    print(f"  só serialização       jsonify:     {ms_enc_jsonify:8.3f} ms")
+    print(f"  só serialização       msgspec:     {ms_enc_msgspec:8.3f} ms"
+          f"  → {ms_enc_jsonify / ms_enc_msgspec:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Mede TTFB, tempo total e bytes trafegados das listagens longas, antes e depois
+da compressão + streaming.
+
+Sobe o app num servidor HTTP real (werkzeug, em thread) e lê a resposta por
+socket, contando os bytes como chegam na rede.
+Uso: python benchmarks/bench_compressao.py [--clientes 2000] [--ordens 3000] [--rodadas 5]
+"""
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def requisitar(porta, metodo, caminho, cabecalhos, corpo=b''):
+    linhas = [f'{metodo} {caminho} HTTP/1.1', 'Host: localhost', 'Connection: close']
+    linhas += [f'{k}: {v}' for k, v in cabecalhos.items()]
+    if corpo:
+        linhas += ['Content-Type: application/x-www-form-urlencoded', f'Content-Length: {len(corpo)}']
+    pedido = ('\r\n'.join(linhas) + '\r\n\r\n').encode() + corpo
+
+    inicio = time.perf_counter()
+    with socket.create_connection(('127.0.0.1', porta)) as s:
+        s.sendall(pedido)
+        recebido = b''
+        ttfb_corpo = None
+        while True:
+            bloco = s.recv(65536)
+            if not bloco:
+                break
+            recebido += bloco
+            if ttfb_corpo is None and b'\r\n\r\n' in recebido and len(recebido) > recebido.index(b'\r\n\r\n') + 4:
+                ttfb_corpo = time.perf_counter() - inicio
+    total = time.perf_counter() - inicio
+    cabecalho = recebido.split(b'\r\n\r\n', 1)[0].decode('latin-1')
+    return ttfb_corpo or total, total, len(recebido), cabecalho
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clientes', type=int, default=2000)
+    parser.add_argument('--ordens', type=int, default=3000)
+    parser.add_argument('--rodadas', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.chdir(tmp)
+
+    from werkzeug.serving import make_server
+    from app import app
+    from semente import semear
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+    with app.app_context():
+        semear(clientes=args.clientes, ordens=args.ordens)
+
+    servidor = make_server('127.0.0.1', 0, app, threaded=True)
+    porta = servidor.server_port
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    _, _, _, cabecalho = requisitar(
+        porta, 'POST', '/login', {}, urlencode({'username': 'admin', 'senha': 'admin'}).encode()
+    )
+    cookie = next(l.split(':', 1)[1].split(';')[0].strip()
+                  for l in cabecalho.split('\r\n') if l.lower().startswith('set-cookie:'))
+
+    rotas = ['/clientes', '/cliente/1/ordens', '/ordens/Pago']
+    cenarios = [
+        ('antes (sem compressão, render completo)', False, False, 'identity'),
+        ('depois gzip + streaming', True, True, 'gzip'),
+        ('depois br + streaming', True, True, 'br, gzip'),
+    ]
+    for nome, comprimir, stream, aceita in cenarios:
+        app.config['COMPRESSAO'] = comprimir
+        app.config['STREAM_LISTAGENS'] = stream
+        print(f'\n{nome}')
+        for rota in rotas:
+            medidas = [requisitar(porta, 'GET', rota, {'Cookie': cookie, 'Accept-Encoding': aceita})
+                       for _ in range(args.rodadas)]
+            ttfb = statistics.median(m[0] for m in medidas) * 1000
+            total = statistics.median(m[1] for m in medidas) * 1000
+            print(f'  {rota:20s} TTFB {ttfb:7.1f} ms   total {total:7.1f} ms   {medidas[0][2]:>9,d} bytes')
+
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Mede o custo de subir um worker: import do app e latência da primeira requisição.
+
+Cada medição roda em um processo Python novo (como um worker recém-criado).
+Uso: python benchmarks/bench_inicializacao.py [--rodadas 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = r'''
+import json, sys, time
+inicio = time.perf_counter()
+import app as modulo
+importado = time.perf_counter()
+if {pdf!r}:
+    import xhtml2pdf.pisa
+pdf = time.perf_counter()
+cliente = modulo.app.test_client()
+resposta = cliente.get('/login')
+primeira = time.perf_counter()
+resposta = cliente.get('/login')
+segunda = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (importado - inicio) * 1000,
+    'pdf_ms': (pdf - importado) * 1000,
+    'primeira_req_ms': (primeira - pdf) * 1000,
+    'segunda_req_ms': (segunda - primeira) * 1000,
+    'modulos': len(sys.modules),
+    'status': resposta.status_code,
+}}))
+'''
+
+
+def medir(pdf, env):
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(pdf=pdf)],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rodadas', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        cenarios = [
+            ('import preguiçoso (atual)', False),
+            ('import antecipado do xhtml2pdf', True),
+        ]
+        for nome, pdf in cenarios:
+            medidas = [medir(pdf, env) for _ in range(args.rodadas)]
+            mediana = {k: statistics.median(m[k] for m in medidas) for k in medidas[0] if k != 'status'}
+            print(f"\n{nome} — mediana de {args.rodadas} processos")
+            print(f"  import do app ........ {mediana['import_ms']:8.1f} ms")
+            print(f"  import do xhtml2pdf .. {mediana['pdf_ms']:8.1f} ms")
+            print(f"  1ª requisição ........ {mediana['primeira_req_ms']:8.1f} ms")
+            print(f"  2ª requisição ........ {mediana['segunda_req_ms']:8.1f} ms")
+            print(f"  módulos carregados ... {int(mediana['modulos']):8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Compara as listagens carregando entidades ORM completas (como era) com as
+projeções de consultas.py, em tempo e em pico de memória (tracemalloc).
+
+Uso: python benchmarks/bench_projecoes.py [--ordens 50000] [--clientes 5000] [--rodadas 3]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def medir(funcao, rodadas, db):
+    tempos = []
+    for _ in range(rodadas):
+        db.session.remove()  # identity map vazio, como numa requisição nova
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    # Memória numa rodada à parte: o tracemalloc deixa tudo bem mais lento
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del resultado
+    return statistics.median(tempos) * 1000, pico / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ordens', type=int, default=50000)
+    parser.add_argument('--clientes', type=int, default=5000)
+    parser.add_argument('--rodadas', type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.chdir(tmp)
+
+    from app import app
+    from models import db, Cliente, OrdemServico
+    import consultas
+    from semente import semear
+
+    with app.app_context():
+        print(f'Semeando {args.ordens} OS / {args.clientes} clientes...', flush=True)
+        semear(clientes=args.clientes, ordens=args.ordens)
+
+        # --- como era: entidades completas + os.total / os.cliente em Python
+        def orm_dashboard():
+            ordens = OrdemServico.query.all()
+            return {s: sum(o.total or 0 for o in ordens if o.status.lower() == s)
+                    for s in ('aberta', 'finalizada', 'pago', 'cancelada')}
+
+        def orm_busca():
+            query = OrdemServico.query.join(Cliente).filter(OrdemServico.status == 'Pago') \
+                .order_by(OrdemServico.data_criacao.desc())
+            ordens = query.all()
+            totais = sum(o.total or 0 for o in ordens)
+            pagina = query.paginate(page=1, per_page=10)
+            return totais, [(o.id, o.cliente.nome) for o in pagina.items]
+
+        def orm_lista_status():
+            ordens = OrdemServico.query.filter(OrdemServico.status.ilike('Aberta')) \
+                .order_by(OrdemServico.data_criacao.desc()).all()
+            return [(o.id, o.cliente.nome, o.data_criacao, o.status) for o in ordens]
+
+        def orm_clientes():
+            return [(c.id, c.nome, c.telefone) for c in Cliente.query.order_by(Cliente.nome).all()]
+
+        # --- projeções
+        def proj_dashboard():
+            return consultas.totais_por_status()
+
+        def proj_busca():
+            filtros = consultas.filtros_busca_ordens(status='Pago')
+            return consultas.totais_por_status(*filtros), consultas.pagina_ordens(filtros)
+
+        def proj_lista_status():
+            return consultas.ordens_com_status('Aberta')
+
+        def proj_clientes():
+            return consultas.listar_clientes()
+
+        casos = [
+            ('dashboard (totais por status)', orm_dashboard, proj_dashboard),
+            ('buscar_ordens (status=Pago)', orm_busca, proj_busca),
+            ('lista_ordens (Aberta)', orm_lista_status, proj_lista_status),
+            ('listar_clientes', orm_clientes, proj_clientes),
+        ]
+        print(f'\nMediana de {args.rodadas} rodadas')
+        print(f"  {'':32s} {'ORM':>20s} {'projeção':>20s}")
+        for nome, orm, proj in casos:
+            t_orm, m_orm = medir(orm, args.rodadas, db)
+            t_proj, m_proj = medir(proj, args.rodadas, db)
+            print(f'  {nome:32s} {t_orm:9.1f} ms {m_orm:6.1f} MB   {t_proj:9.1f} ms {m_proj:6.1f} MB'
+                  f'   ({t_orm / max(t_proj, 1e-9):.0f}× mais rápido)', flush=True)
+
+
+if __name__ == '__main__':
+    main()
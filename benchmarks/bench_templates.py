@@ -0,0 +1,119 @@
+"""Mede o custo dos templates: compilação num worker recém-criado (com e sem o
+cache de bytecode em disco) e renderização em regime das telas mais usadas
+(com e sem o {% cache %} de fragmentos).
+
+Uso: python benchmarks/bench_templates.py [--rodadas 7] [--itens 30] [--repeticoes 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+SCRIPT_FRIO = r'''
+import json, time
+import app as modulo
+from cache_templates import precompilar_templates
+inicio = time.perf_counter()
+nomes = precompilar_templates(modulo.app)
+print(json.dumps({'ms': (time.perf_counter() - inicio) * 1000, 'templates': len(nomes)}))
+'''
+
+
+def compilar_em_processo_novo(env):
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT_FRIO],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def partida_a_frio(tmp, rodadas):
+    base = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'frio.db')}")
+    pasta = os.path.join(tmp, 'jinja_cache')
+    cenarios = [
+        ('sem cache de bytecode', dict(base, JINJA_BYTECODE_CACHE='0')),
+        ('com cache de bytecode', dict(base, JINJA_CACHE_DIR=pasta)),
+    ]
+    compilar_em_processo_novo(cenarios[1][1])  # popula o cache (como o flask compilar-templates)
+
+    print(f"\nCompilação de todos os templates num processo novo — mediana de {rodadas}")
+    for nome, env in cenarios:
+        medidas = [compilar_em_processo_novo(env) for _ in range(rodadas)]
+        ms = statistics.median(m['ms'] for m in medidas)
+        print(f"  {nome:24s} {ms:8.1f} ms  ({medidas[0]['templates']} templates)")
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def regime(tmp, itens, repeticoes):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(tmp, 'jinja_cache')
+    os.chdir(tmp)
+
+    from flask import g, render_template
+    from app import app, db
+    from models import Empresa, OrdemServico
+    from semente import semear
+
+    app.config['SESSION_COOKIE_SECURE'] = False
+    with app.app_context():
+        semear(clientes=200, ordens=500, itens_por_os=itens)
+        os_id = db.session.execute(db.select(OrdemServico.id).order_by(OrdemServico.id)).scalars().first()
+
+    cliente = app.test_client()
+    cliente.post('/login', data={'username': 'admin', 'senha': 'admin'})
+
+    def render_pdf():
+        # Só o HTML do PDF: o xhtml2pdf não muda com o cache e dominaria a medida
+        from app import validadores_pdf
+        with app.test_request_context(f'/os/{os_id}/pdf'):
+            g.etag = validadores_pdf(os_id)[0]
+            ordem = db.session.get(OrdemServico, os_id)
+            render_template('os_pdf.html', os=ordem, subtotal=0, total=0, empresa=Empresa.query.first())
+            db.session.remove()
+
+    rotas = [
+        (f'GET /os/{os_id} ({itens} itens)', lambda: cliente.get(f'/os/{os_id}')),
+        (f'HTML do PDF ({itens} itens)', render_pdf),
+        ('GET /ordens (página de 10)', lambda: cliente.get('/ordens')),
+    ]
+    print(f"\nRenderização em regime — mediana de {repeticoes} requisições")
+    for nome, ativo in (('sem {% cache %}', False), ('com {% cache %}', True)):
+        app.jinja_env.cache_fragmentos_ativo = ativo
+        app.jinja_env.cache_fragmentos.limpar()
+        print(f"  {nome}")
+        for rota, funcao in rotas:
+            funcao()  # aquece (compila o template, preenche o cache)
+            print(f"    {rota:28s} {medir(funcao, repeticoes):7.2f} ms")
+    cache = app.jinja_env.cache_fragmentos
+    print(f"  fragmentos em cache: {len(cache)} ({cache.bytes / 1024:.1f} KB), acertos {cache.acertos}, falhas {cache.falhas}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rodadas', type=int, default=7)
+    parser.add_argument('--itens', type=int, default=30)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        partida_a_frio(tmp, args.rodadas)
+        regime(tmp, args.itens, args.repeticoes)
+
+
+if __name__ == '__main__':
+    main()
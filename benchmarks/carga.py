@@ -0,0 +1,304 @@
+"""Teste de carga contra um gunicorn de verdade.
+
+Popula um banco local, sobe o app com gunicorn.conf.py para cada combinação de
+classe de worker × workers × threads e, em concorrência crescente, repete um
+cenário ponderado: login, busca de OS, criação de OS, edição de OS e PDF.
+Relata vazão, latência p50/p95/p99 e taxa de erro por rota.
+
+Uso:
+  python benchmarks/carga.py --classes sync,gthread --workers 2,4 --threads 1,4 \\
+      --concorrencias 4,16,32 --duracao 20
+  python benchmarks/carga.py --database-url postgresql://localhost/condomtech_carga  # banco já populado
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+STATUS = ['Aberta', 'Em andamento', 'Finalizada', 'Cancelada', 'Pago']
+
+
+# 👤 Usuário virtual: uma conexão keep-alive e o próprio cookie de sessão
+class Usuario:
+    def __init__(self, porta, rnd, ordens, clientes, produtos, timeout):
+        self.conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=timeout)
+        self.rnd = rnd
+        self.ordens = ordens
+        self.clientes = clientes
+        self.produtos = produtos
+        self.cookie = None
+
+    def requisitar(self, metodo, caminho, campos=None):
+        cabecalhos = {'Accept-Encoding': 'gzip, br'}
+        if self.cookie:
+            cabecalhos['Cookie'] = self.cookie
+        corpo = None
+        if campos is not None:
+            corpo = urlencode(campos, doseq=True)
+            cabecalhos['Content-Type'] = 'application/x-www-form-urlencoded'
+        try:
+            self.conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+            resposta = self.conexao.getresponse()
+            resposta.read()
+        except (http.client.HTTPException, OSError):
+            self.conexao.close()  # reabre na próxima requisição
+            raise
+        for valor in resposta.headers.get_all('Set-Cookie') or ():
+            if valor.startswith('session='):
+                self.cookie = valor.split(';', 1)[0]
+        if resposta.headers.get('Connection', '').lower() == 'close':
+            self.conexao.close()
+        return resposta.status, resposta.headers.get('Location', '')
+
+    # Cada ação devolve se deu certo; a rota de cada uma está em CENARIO
+    def login(self):
+        status, destino = self.requisitar('POST', '/login', {'username': 'admin', 'senha': 'admin'})
+        return status == 302 and '/login' not in destino
+
+    def buscar(self):
+        campos = self.rnd.choice([
+            {},
+            {'status': self.rnd.choice(STATUS)},
+            {'busca': f'Condomínio {self.rnd.randint(1, self.clientes):05d}'},
+            {'mes': self.rnd.randint(1, 12)},
+        ])
+        status, _ = self.requisitar('GET', '/ordens?' + urlencode(campos))
+        return status == 200
+
+    def nova_os(self):
+        n = self.rnd.randint(1, 8)
+        status, destino = self.requisitar('POST', '/nova_os', {
+            'cliente': self.rnd.randint(1, self.clientes),
+            'produto[]': [self.rnd.randint(1, self.produtos) for _ in range(n)],
+            'quantidade[]': [self.rnd.randint(1, 5) for _ in range(n)],
+            'desconto': 0, 'observacoes': 'carga',
+        })
+        return status == 302 and '/os/' in destino
+
+    def editar_os(self):
+        os_id = self.rnd.randint(1, self.ordens)
+        status, destino = self.requisitar('POST', f'/os/{os_id}/editar', {
+            'data_criacao': time.strftime('%Y-%m-%d'),
+            'status': self.rnd.choice(STATUS),
+            'desconto': self.rnd.choice([0, 10]),
+            'observacoes': 'editada na carga',
+        })
+        return status == 302 and '/login' not in destino
+
+    def pdf(self):
+        status, _ = self.requisitar('GET', f'/os/{self.rnd.randint(1, self.ordens)}/pdf')
+        return status == 200
+
+
+# (ação, rota em que ela é contabilizada — sucesso ou falha —, peso)
+CENARIO = [
+    ('login', 'POST /login', 5),
+    ('buscar', 'GET /ordens', 45),
+    ('nova_os', 'POST /nova_os', 15),
+    ('editar_os', 'POST /os/<id>/editar', 15),
+    ('pdf', 'GET /os/<id>/pdf', 20),
+]
+
+
+def rodar_nivel(porta, concorrencia, duracao, args):
+    fim = time.perf_counter() + duracao
+    medidas = defaultdict(list)
+    erros = defaultdict(int)
+    trava = threading.Lock()
+    opcoes = [(acao, rota) for acao, rota, _ in CENARIO]
+    pesos = [peso for _, _, peso in CENARIO]
+
+    def virtual(n):
+        rnd = random.Random(n)
+        usuario = Usuario(porta, rnd, args.ordens, args.clientes, args.produtos, args.timeout)
+        locais, falhas = defaultdict(list), defaultdict(int)
+        try:
+            usuario.login()
+        except (http.client.HTTPException, OSError):
+            pass
+        while time.perf_counter() < fim:
+            acao, rota = rnd.choices(opcoes, pesos)[0]
+            inicio = time.perf_counter()
+            try:
+                ok = getattr(usuario, acao)()
+            except (http.client.HTTPException, OSError):
+                ok = False
+            locais[rota].append(time.perf_counter() - inicio)
+            if not ok:
+                falhas[rota] += 1
+        usuario.conexao.close()
+        with trava:
+            for rota, tempos in locais.items():
+                medidas[rota].extend(tempos)
+            for rota, n_falhas in falhas.items():
+                erros[rota] += n_falhas
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=virtual, args=(i,)) for i in range(concorrencia)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return medidas, erros, time.perf_counter() - inicio
+
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def resumir(medidas, erros, duracao):
+    linhas = {}
+    for rota, tempos in sorted(medidas.items()):
+        tempos = sorted(tempos)
+        linhas[rota] = {
+            'requisicoes': len(tempos),
+            'rps': len(tempos) / duracao,
+            'p50_ms': percentil(tempos, 50) * 1000,
+            'p95_ms': percentil(tempos, 95) * 1000,
+            'p99_ms': percentil(tempos, 99) * 1000,
+            'erro_pct': 100 * erros.get(rota, 0) / len(tempos),
+        }
+    total = sum(len(t) for t in medidas.values())
+    total_erros = sum(erros.values())
+    return {
+        'rps': total / duracao,
+        'erro_pct': 100 * total_erros / total if total else 0.0,
+        'rotas': linhas,
+    }
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def subir_gunicorn(classe, workers, threads, database_url, tmp):
+    porta = porta_livre()
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        GUNICORN_BIND=f'127.0.0.1:{porta}',
+        GUNICORN_WORKER_CLASS=classe,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        PYTHONPATH=RAIZ + os.pathsep + os.environ.get('PYTHONPATH', ''),
+    )
+    log = open(os.path.join(tmp, f'gunicorn-{classe}-{workers}x{threads}.log'), 'w')
+    # cwd no diretório temporário: as sessões (flask_session/) não caem no repositório
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(RAIZ, 'gunicorn.conf.py'),
+         '--access-logfile', '/dev/null', 'app:app'],
+        cwd=tmp, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    limite = time.time() + 60
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f'gunicorn saiu com código {processo.returncode}; veja {log.name}')
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=2)
+            conexao.request('GET', '/login')
+            if conexao.getresponse().status == 200:
+                return processo, porta, log
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError(f'gunicorn não respondeu em 60 s; veja {log.name}')
+
+
+def parar_gunicorn(processo, log):
+    processo.send_signal(signal.SIGTERM)
+    try:
+        processo.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+    log.close()
+
+
+def semear_banco(database_url, tmp, args):
+    os.environ['DATABASE_URL'] = database_url
+    os.chdir(tmp)
+    from app import app, db
+    from semente import semear
+
+    with app.app_context():
+        semear(clientes=args.clientes, produtos=args.produtos, ordens=args.ordens)
+        db.engine.dispose()
+
+
+def lista_int(valor):
+    return [int(v) for v in valor.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--classes', default='sync,gthread', help='Classes de worker (sync, gthread, ...).')
+    parser.add_argument('--workers', type=lista_int, default=[2, 4])
+    parser.add_argument('--threads', type=lista_int, default=[1, 4])
+    parser.add_argument('--concorrencias', type=lista_int, default=[4, 16, 32])
+    parser.add_argument('--duracao', type=float, default=20, help='Segundos por nível de concorrência.')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout do cliente por requisição (s).')
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--produtos', type=int, default=100)
+    parser.add_argument('--ordens', type=int, default=2000)
+    parser.add_argument('--database-url', help='Banco já populado; sem ele, um SQLite novo é semeado.')
+    parser.add_argument('--json', help='Grava os resultados completos neste arquivo.')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='carga-')
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tmp, 'carga.db')}"
+        semear_banco(database_url, tmp, args)
+    print(f'Banco: {database_url}\nLogs do gunicorn em {tmp}')
+
+    resultados = []
+    classes = [c for c in args.classes.split(',') if c]
+    for classe, workers, threads in itertools.product(classes, args.workers, args.threads):
+        # O sync ignora threads; só vale medir threads > 1 nas classes que usam
+        if classe == 'sync' and threads > 1:
+            continue
+        processo, porta, log = subir_gunicorn(classe, workers, threads, database_url, tmp)
+        try:
+            print(f'\n━━ {classe} — {workers} workers × {threads} threads ━━')
+            for concorrencia in args.concorrencias:
+                medidas, erros, duracao = rodar_nivel(porta, concorrencia, args.duracao, args)
+                resumo = resumir(medidas, erros, duracao)
+                resultados.append({'classe': classe, 'workers': workers, 'threads': threads,
+                                   'concorrencia': concorrencia, **resumo})
+                print(f'  concorrência {concorrencia:3d}: {resumo["rps"]:7.1f} req/s, erros {resumo["erro_pct"]:5.1f}%')
+                for rota, r in resumo['rotas'].items():
+                    print(f'    {rota:22s} {r["requisicoes"]:6d} req  p50 {r["p50_ms"]:7.1f}  '
+                          f'p95 {r["p95_ms"]:7.1f}  p99 {r["p99_ms"]:7.1f} ms  erros {r["erro_pct"]:5.1f}%')
+        finally:
+            parar_gunicorn(processo, log)
+
+    print('\nResumo (req/s | p95 geral mais alto entre as rotas | erros)')
+    for r in resultados:
+        p95 = max((x['p95_ms'] for x in r['rotas'].values()), default=0)
+        print(f"  {r['classe']:8s} {r['workers']}w×{r['threads']}t  c={r['concorrencia']:<3d} "
+              f"{r['rps']:7.1f} req/s  p95 máx {p95:7.1f} ms  erros {r['erro_pct']:5.1f}%")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
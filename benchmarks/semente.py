@@ -0,0 +1,50 @@
+"""Popula um banco de teste com dados sintéticos para os benchmarks."""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from models import db, Cliente, Empresa, Produto, OrdemServico, ItemOS, Usuario, STATUS_OS
+
+STATUS = list(STATUS_OS)
+LOTE = 5000
+
+
+def _inserir(modelo, linhas):
+    for i in range(0, len(linhas), LOTE):
+        db.session.execute(insert(modelo), linhas[i:i + LOTE])
+
+
+def semear(clientes=200, produtos=100, ordens=2000, itens_por_os=5, semente=42):
+    """Cria tabelas e insere dados; deve rodar dentro de um app_context."""
+    rnd = random.Random(semente)
+    db.create_all()
+
+    db.session.execute(insert(Usuario), [{
+        'username': 'admin', 'senha': generate_password_hash('admin'),
+    }])
+    db.session.execute(insert(Empresa), [{
+        'nome': 'Empresa Exemplo', 'endereco': 'Quadra 104 Norte', 'telefone': '(63) 3214-0000',
+        'email': 'contato@exemplo.com', 'cnpj': '00000000000100', 'site': 'exemplo.com',
+    }])
+    _inserir(Cliente, [{
+        'id': i, 'nome': f'Condomínio {i:05d}', 'telefone': f'(63) 9{i:08d}',
+        'email': f'cliente{i}@exemplo.com', 'cpf_cnpj': f'{i:014d}', 'cidade': 'Palmas',
+    } for i in range(1, clientes + 1)])
+    _inserir(Produto, [{
+        'id': i, 'nome': f'Produto {i:04d}', 'descricao': f'Descrição do produto {i}',
+        'preco': round(rnd.uniform(5, 500), 2), 'tipo': rnd.choice(['Produto', 'Serviço']),
+    } for i in range(1, produtos + 1)])
+
+    inicio = datetime.utcnow() - timedelta(days=730)
+    _inserir(OrdemServico, [{
+        'id': i, 'cliente_id': rnd.randint(1, clientes), 'observacoes': f'Observação {i}',
+        'data_criacao': inicio + timedelta(minutes=i * 730 * 24 * 60 // max(ordens, 1)),
+        'desconto': rnd.choice([0.0, 0.0, 10.0, 25.0]), 'status': rnd.choice(STATUS),
+    } for i in range(1, ordens + 1)])
+    _inserir(ItemOS, [{
+        'os_id': os_id, 'produto_id': rnd.randint(1, produtos), 'quantidade': rnd.randint(1, 10),
+    } for os_id in range(1, ordens + 1) for _ in range(itens_por_os)])
+
+    db.session.commit()
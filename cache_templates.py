@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from jinja2 import FileSystemBytecodeCache, Undefined, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from config import env_bool, env_int
+from condicional import VERSAO_APP
+
+
+# 🧠 LRU limitado pelo tamanho total dos fragmentos (por processo). Os workers
+# gthread renderizam em paralelo, por isso o lock.
+class CacheLRU:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            valor = self._itens.get(chave)
+            if valor is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def set(self, chave, valor):
+        tamanho = len(valor)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self.bytes -= len(anterior)
+            self._itens[chave] = valor
+            self.bytes += tamanho
+            while self.bytes > self.max_bytes:
+                _, removido = self._itens.popitem(last=False)
+                self.bytes -= len(removido)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.bytes = self.acertos = self.falhas = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+
+# 🧩 {% cache 'os-itens', os.id, os.versao %} ... {% endcache %}
+# A chave precisa mudar sempre que o conteúdo muda (versão da OS, ETag...):
+# não há expiração por tempo. Se alguma parte da chave for None ou indefinida
+# (ex.: g.etag fora de uma view @condicional), renderiza sem cache.
+class CacheFragmentos(Extension):
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(
+            cache_fragmentos=CacheLRU(env_int('FRAGMENTOS_MAX_BYTES', 16 * 1024 * 1024)),
+            cache_fragmentos_ativo=env_bool('CACHE_FRAGMENTOS', True),
+        )
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        partes = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            partes.append(parser.parse_expression())
+        corpo = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_renderizar', [nodes.List(partes)]), [], [], corpo
+        ).set_lineno(lineno)
+
+    def _renderizar(self, partes, caller):
+        if not self.environment.cache_fragmentos_ativo or any(p is None or isinstance(p, Undefined) for p in partes):
+            return caller()
+        cache = self.environment.cache_fragmentos
+        chave = (VERSAO_APP,) + tuple(partes)
+        html = cache.get(chave)
+        if html is None:
+            html = str(caller())
+            cache.set(chave, html)
+        return Markup(html)
+
+
+def precompilar_templates(app):
+    """Compila todos os templates (e grava o bytecode, se o cache estiver ativo)."""
+    nomes = app.jinja_env.list_templates(extensions=('html',))
+    for nome in nomes:
+        app.jinja_env.get_template(nome)
+    return nomes
+
+
+# 📚 Bytecode compilado em disco, compartilhado entre workers e reinícios: um
+# worker novo carrega o template pronto em vez de compilar o Jinja de novo.
+# O arquivo é invalidado sozinho quando o template muda (checksum do fonte).
+def init_cache_templates(app):
+    app.jinja_env.add_extension(CacheFragmentos)
+    if not env_bool('JINJA_BYTECODE_CACHE', True):
+        return
+    pasta = os.getenv('JINJA_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(pasta, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(pasta)
+
+
+# 🔥 flask compilar-templates — no build/deploy, para o primeiro worker já achar o bytecode pronto
+@click.command('compilar-templates')
+@with_appcontext
+def compilar_templates_cmd():
+    """Compila todos os templates e grava o bytecode no cache em disco."""
+    nomes = precompilar_templates(current_app)
+    click.echo(f"{len(nomes)} templates compilados.")
@@ -0,0 +1,122 @@
+import gzip
+import zlib
+
+from flask import current_app, render_template, request, stream_template
+
+from config import env_bool, env_int
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele só gzip
+    brotli = None
+
+# 🗜️ Só tipos textuais; PDF, imagens e fontes já são comprimidos
+TIPOS_COMPRIMIVEIS = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/javascript', 'application/json', 'image/svg+xml',
+}
+NIVEL_GZIP = 6
+QUALIDADE_BROTLI = 5  # respostas dinâmicas: bom ganho sem pesar na CPU
+
+# Blocos do streaming: o primeiro sai cedo (cabeçalho da página), os demais
+# agrupam os pedaços minúsculos que o Jinja gera.
+PRIMEIRO_BLOCO = 2 * 1024
+BLOCO = 16 * 1024
+
+
+def _codificacao_aceita():
+    aceitas = request.accept_encodings
+    if brotli is not None and aceitas['br']:
+        return 'br'
+    if aceitas['gzip']:
+        return 'gzip'
+    return None
+
+
+def _comprimir(dados, codificacao):
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=QUALIDADE_BROTLI)
+    return gzip.compress(dados, compresslevel=NIVEL_GZIP)
+
+
+def _comprimir_fluxo(pedacos, codificacao):
+    # Cada pedaço é enviado já comprimido (flush), para o navegador começar a
+    # processar a página antes do fim da renderização.
+    if codificacao == 'br':
+        compressor = brotli.Compressor(quality=QUALIDADE_BROTLI)
+        for pedaco in pedacos:
+            saida = compressor.process(pedaco) + compressor.flush()
+            if saida:
+                yield saida
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for pedaco in pedacos:
+            saida = compressor.compress(pedaco) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if saida:
+                yield saida
+        yield compressor.flush()
+
+
+def _em_bytes(pedacos):
+    for pedaco in pedacos:
+        yield pedaco.encode('utf-8') if isinstance(pedaco, str) else pedaco
+
+
+def comprimir_resposta(resposta):
+    if not current_app.config.get('COMPRESSAO', True):
+        return resposta
+    if resposta.status_code < 200 or resposta.status_code in (204, 304):
+        return resposta
+    if resposta.direct_passthrough or 'Content-Encoding' in resposta.headers:
+        return resposta
+    if resposta.mimetype not in TIPOS_COMPRIMIVEIS:
+        return resposta
+
+    resposta.vary.add('Accept-Encoding')
+    codificacao = _codificacao_aceita()
+    if codificacao is None:
+        return resposta
+
+    if resposta.is_streamed:
+        resposta.response = _comprimir_fluxo(_em_bytes(resposta.response), codificacao)
+        resposta.headers.pop('Content-Length', None)
+    else:
+        dados = resposta.get_data()
+        if len(dados) < current_app.config['COMPRESSAO_TAMANHO_MINIMO']:
+            return resposta
+        resposta.set_data(_comprimir(dados, codificacao))
+
+    resposta.headers['Content-Encoding'] = codificacao
+    # O corpo mudou de bytes: o validador forte vira fraco (como faz o nginx)
+    etag, fraco = resposta.get_etag()
+    if etag and not fraco:
+        resposta.set_etag(etag, weak=True)
+    return resposta
+
+
+def _agrupar(pedacos):
+    buffer, tamanho, limite = [], 0, PRIMEIRO_BLOCO
+    for pedaco in pedacos:
+        buffer.append(pedaco)
+        tamanho += len(pedaco)
+        if tamanho >= limite:
+            yield ''.join(buffer)
+            buffer, tamanho, limite = [], 0, BLOCO
+    if buffer:
+        yield ''.join(buffer)
+
+
+# 📜 Listagens longas: o navegador recebe o <head> e o começo da tabela
+# enquanto o resto ainda está sendo renderizado.
+def renderizar_listagem(template, **contexto):
+    if not current_app.config.get('STREAM_LISTAGENS', True):
+        return render_template(template, **contexto)
+    return current_app.response_class(_agrupar(stream_template(template, **contexto)), mimetype='text/html')
+
+
+def init_compressao(app):
+    app.config.setdefault('COMPRESSAO', env_bool('COMPRESSAO', True))
+    app.config.setdefault('COMPRESSAO_TAMANHO_MINIMO', env_int('COMPRESSAO_TAMANHO_MINIMO', 1024))
+    app.config.setdefault('STREAM_LISTAGENS', env_bool('STREAM_LISTAGENS', True))
+    app.after_request(comprimir_resposta)
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from functools import wraps
+
+from flask import g, make_response, request
+
+# 🔖 Entra em todo ETag: um deploy novo (templates diferentes) invalida os caches
+VERSAO_APP = os.getenv('APP_VERSION') or os.getenv('RENDER_GIT_COMMIT') or 'dev'
+
+
+def gerar_etag(*partes):
+    chave = '|'.join(str(p) for p in (VERSAO_APP,) + partes)
+    return hashlib.sha1(chave.encode()).hexdigest()[:20]
+
+
+def _nao_modificado(etag, modificado_em):
+    # If-None-Match tem precedência; If-Modified-Since só vale sozinho (RFC 9110).
+    # Comparação fraca: a compressão transforma o ETag em W/"..."
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if modificado_em is not None and request.if_modified_since is not None:
+        return modificado_em.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _aplicar_validadores(resposta, etag, modificado_em):
+    resposta.set_etag(etag)
+    if modificado_em is not None:
+        resposta.last_modified = modificado_em.replace(microsecond=0)
+    # Conteúdo exige login: o navegador guarda, mas revalida sempre
+    resposta.headers['Cache-Control'] = 'private, no-cache'
+    return resposta
+
+
+# 📨 GET condicional: `calcular` recebe os mesmos argumentos da view e devolve
+# (etag, modificado_em) com uma consulta leve, ou None para seguir sem cache.
+# Se o cliente já tem a versão atual, responde 304 sem renderizar nada.
+# O ETag fica em g.etag — serve de chave para o {% cache %} dos templates.
+def condicional(calcular):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+            validadores = calcular(*args, **kwargs)
+            if validadores is None:
+                return f(*args, **kwargs)
+
+            etag, modificado_em = validadores
+            g.etag = etag
+            if _nao_modificado(etag, modificado_em):
+                return _aplicar_validadores(make_response('', 304), etag, modificado_em)
+
+            resposta = make_response(f(*args, **kwargs))
+            if resposta.status_code == 200:
+                _aplicar_validadores(resposta, etag, modificado_em)
+            return resposta
+        return decorated_function
+    return decorator
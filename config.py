@@ -0,0 +1,213 @@
+import logging
+import os
+import sqlite3
+import time
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger('condomtech.db')
+
+# ⚙️ Leitura de variáveis de ambiente
+def env_int(nome, padrao):
+    valor = os.getenv(nome, '').strip()
+    return int(valor) if valor else padrao
+
+
+def env_bool(nome, padrao):
+    valor = os.getenv(nome, '').strip().lower()
+    if not valor:
+        return padrao
+    return valor in ('1', 'true', 'sim', 'yes', 'on')
+
+
+# 🦄 Mesmos valores usados em gunicorn.conf.py — o pool é dimensionado por eles
+GUNICORN_WORKERS = env_int('WEB_CONCURRENCY', 3)
+GUNICORN_THREADS = env_int('GUNICORN_THREADS', 2)
+
+# 🌐 Perfis de banco: cada worker é um processo com seu próprio pool,
+# então o tamanho do pool acompanha as threads de um único worker.
+PERFIS_BANCO = {
+    # Postgres remoto (Render): conexões caem após ociosidade, então
+    # pre-ping, recycle curto e keepalives TCP.
+    'remoto': {
+        'pool_size': GUNICORN_THREADS,
+        'max_overflow': max(1, GUNICORN_THREADS // 2),
+        'pool_timeout': 10,
+        'pool_recycle': 280,
+        'pool_pre_ping': True,
+        'statement_timeout_ms': 30000,
+        'keepalives_idle': 30,
+    },
+    # Postgres na mesma rede/máquina: conexões estáveis, pre-ping dispensável.
+    'local': {
+        'pool_size': GUNICORN_THREADS,
+        'max_overflow': GUNICORN_THREADS,
+        'pool_timeout': 5,
+        'pool_recycle': 1800,
+        'pool_pre_ping': False,
+        'statement_timeout_ms': 60000,
+        'keepalives_idle': 120,
+    },
+}
+
+# 🪶 Modo SQLite embarcado (um arquivo local por site)
+PERFIL_SQLITE = {
+    'pool_size': GUNICORN_THREADS,
+    'max_overflow': GUNICORN_THREADS,
+    'busy_timeout_ms': env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+    'cache_size_kb': env_int('SQLITE_CACHE_SIZE_KB', 65536),
+    'mmap_size': env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+}
+
+# Aviso quando a espera por uma conexão livre passar deste limite
+POOL_ESPERA_AVISO_MS = env_int('DB_POOL_WAIT_WARN_MS', 50)
+
+
+class PoolCronometrado(QueuePool):
+    """QueuePool que registra quanto tempo cada checkout esperou por uma conexão."""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera_ms = (time.perf_counter() - inicio) * 1000
+            if espera_ms >= POOL_ESPERA_AVISO_MS:
+                logger.warning(
+                    "Espera por conexão do pool: %.1f ms (em uso: %d, livres: %d, overflow: %d)",
+                    espera_ms, self.checkedout(), self.checkedin(), self.overflow()
+                )
+            else:
+                logger.debug("Espera por conexão do pool: %.1f ms", espera_ms)
+
+
+def normalizar_url(url):
+    # Alguns provedores ainda entregam o esquema antigo "postgres://"
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+SQLITE_LOCAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'orcamento.db')
+
+
+# Sem DATABASE_URL, o SQLite local só é usado se pedido (DB_PROFILE=sqlite):
+# uma variável esquecida em produção não pode subir o app sobre um arquivo velho.
+def url_banco():
+    url = os.getenv('DATABASE_URL', '').strip()
+    if url:
+        return normalizar_url(url)
+    if os.getenv('DB_PROFILE', '').strip().lower() == 'sqlite':
+        return f'sqlite:///{SQLITE_LOCAL}'
+    raise RuntimeError(
+        'DATABASE_URL não definida. Para usar o SQLite local '
+        f'({SQLITE_LOCAL}), defina DB_PROFILE=sqlite ou DATABASE_URL=sqlite:///...'
+    )
+
+
+# 📖 Réplica de leitura opcional (ver replica.py)
+def url_replica():
+    url = os.getenv('DATABASE_REPLICA_URL', '').strip()
+    return normalizar_url(url) if url else None
+
+
+def perfil_banco(url):
+    if url.startswith('sqlite'):
+        return 'sqlite'
+    nome = os.getenv('DB_PROFILE', '').strip().lower()
+    if nome:
+        if nome not in PERFIS_BANCO:
+            raise ValueError(f"DB_PROFILE inválido para {url.split(':', 1)[0]}: {nome!r} (opções: {', '.join(PERFIS_BANCO)})")
+        return nome
+    if url.startswith('postgresql') and any(h in url for h in ('@localhost', '@127.0.0.1', '@db:')):
+        return 'local'
+    return 'remoto'
+
+
+def opcoes_engine(url, perfil=None):
+    if url.startswith('sqlite'):
+        if url in ('sqlite://', 'sqlite:///:memory:'):
+            return {}
+        return {
+            'poolclass': PoolCronometrado,
+            'pool_size': env_int('DB_POOL_SIZE', PERFIL_SQLITE['pool_size']),
+            'max_overflow': env_int('DB_MAX_OVERFLOW', PERFIL_SQLITE['max_overflow']),
+            'pool_timeout': env_int('DB_POOL_TIMEOUT', 10),
+            'connect_args': {
+                'timeout': PERFIL_SQLITE['busy_timeout_ms'] / 1000,
+                'check_same_thread': False,
+            },
+        }
+
+    perfil = dict(PERFIS_BANCO[perfil or perfil_banco(url)])
+
+    # Qualquer valor do perfil pode ser sobrescrito individualmente
+    pool_size = env_int('DB_POOL_SIZE', perfil['pool_size'])
+    max_overflow = env_int('DB_MAX_OVERFLOW', perfil['max_overflow'])
+    pool_timeout = env_int('DB_POOL_TIMEOUT', perfil['pool_timeout'])
+    pool_recycle = env_int('DB_POOL_RECYCLE', perfil['pool_recycle'])
+    pool_pre_ping = env_bool('DB_POOL_PRE_PING', perfil['pool_pre_ping'])
+    statement_timeout = env_int('DB_STATEMENT_TIMEOUT_MS', perfil['statement_timeout_ms'])
+    keepalives_idle = env_int('DB_KEEPALIVES_IDLE', perfil['keepalives_idle'])
+
+    return {
+        'poolclass': PoolCronometrado,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pool_pre_ping,
+        'connect_args': {
+            'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 10),
+            'options': f'-c statement_timeout={statement_timeout}',
+            'keepalives': 1,
+            'keepalives_idle': keepalives_idle,
+            'keepalives_interval': 10,
+            'keepalives_count': 5,
+        },
+    }
+
+
+# 🔧 PRAGMAs aplicados em toda conexão SQLite nova
+@event.listens_for(Engine, 'connect')
+def _ajustar_conexao_sqlite(dbapi_conn, connection_record):
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return
+    # O BEGIN passa a ser emitido por _iniciar_transacao_sqlite
+    dbapi_conn.isolation_level = None
+    cursor = dbapi_conn.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute(f"PRAGMA busy_timeout={PERFIL_SQLITE['busy_timeout_ms']}")
+    cursor.execute(f"PRAGMA cache_size=-{PERFIL_SQLITE['cache_size_kb']}")
+    cursor.execute(f"PRAGMA mmap_size={PERFIL_SQLITE['mmap_size']}")
+    cursor.close()
+
+
+# ✍️ Escritas serializadas entre workers: requisições que alteram dados (e
+# comandos CLI) abrem a transação com BEGIN IMMEDIATE, pegando a trava de
+# escrita logo no início e esperando o busy_timeout em vez de falhar com
+# "database is locked" ao promover uma leitura para escrita no meio do caminho.
+# Por isso nenhuma rota GET pode gravar: exclusões e afins são sempre POST.
+@event.listens_for(Engine, 'begin')
+def _iniciar_transacao_sqlite(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    somente_leitura = has_request_context() and request.method in ('GET', 'HEAD', 'OPTIONS')
+    conn.exec_driver_sql('BEGIN' if somente_leitura else 'BEGIN IMMEDIATE')
+
+
+def configurar_banco(app):
+    url = url_banco()
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = opcoes_engine(url)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    replica = url_replica()
+    if replica:
+        app.config['SQLALCHEMY_BINDS'] = {'replica': {'url': replica, **opcoes_engine(replica)}}
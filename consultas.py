@@ -0,0 +1,204 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import String, bindparam, cast, func, or_, select, union
+
+from models import db, Cliente, ItemOS, OrdemServico, Produto, STATUS_EM_ABERTO
+
+# 📖 Modelo de leitura das listagens: SELECT só das colunas exibidas, linhas em
+# NamedTuple (sem identity map, rastreamento de alterações nem lazy loads).
+
+
+class LinhaOrdem(NamedTuple):
+    id: int
+    cliente_id: int
+    cliente_nome: str
+    data_criacao: Optional[datetime]
+    status: Optional[str]
+    desconto: Optional[float]
+    subtotal: float
+    versao: int
+
+    @property
+    def total(self):
+        # Mesmo cálculo de OrdemServico.total
+        return self.subtotal - (self.desconto or 0)
+
+
+class LinhaCliente(NamedTuple):
+    id: int
+    nome: str
+    telefone: Optional[str]
+    email: Optional[str]
+    cpf_cnpj: str
+    cidade: Optional[str]
+
+
+class TotalStatus(NamedTuple):
+    quantidade: int
+    valor: float
+
+
+class Pagina(NamedTuple):
+    items: list
+    page: int
+    has_next: bool
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+
+def subtotais_por_os(item=ItemOS):
+    return (
+        select(
+            item.os_id.label('os_id'),
+            func.sum(item.quantidade * Produto.preco).label('subtotal'),
+        )
+        .join(Produto, Produto.id == item.produto_id)
+        .group_by(item.os_id)
+        .subquery()
+    )
+
+
+def subtotal_da_linha():
+    # Subconsulta correlacionada: só calcula para as linhas que saem na página
+    return (
+        select(func.coalesce(func.sum(ItemOS.quantidade * Produto.preco), 0))
+        .join(Produto, Produto.id == ItemOS.produto_id)
+        .where(ItemOS.os_id == OrdemServico.id)
+        .scalar_subquery()
+    )
+
+
+def _select_ordens():
+    return (
+        select(
+            OrdemServico.id, OrdemServico.cliente_id, Cliente.nome, OrdemServico.data_criacao,
+            OrdemServico.status, OrdemServico.desconto, subtotal_da_linha(), OrdemServico.versao,
+        )
+        .join(Cliente, Cliente.id == OrdemServico.cliente_id)
+    )
+
+
+def _linhas(modelo, consulta):
+    return [modelo._make(linha) for linha in db.session.execute(consulta)]
+
+
+# 🔎 Busca de ordens
+def filtros_busca_ordens(termo='', status='', mes=None):
+    filtros = []
+    if termo:
+        filtros.append(or_(
+            Cliente.nome.ilike(f'%{termo}%'),
+            cast(OrdemServico.data_criacao, String).ilike(f'%{termo}%'),
+        ))
+    if status:
+        filtros.append(OrdemServico.status == status)
+    if mes and 1 <= mes <= 12:
+        filtros.append(db.extract('month', OrdemServico.data_criacao) == mes)
+    return filtros
+
+
+def pagina_ordens(filtros, page=1, por_pagina=10):
+    # LIMIT por_pagina + 1 diz se há próxima página sem um COUNT(*)
+    page = max(page, 1)
+    linhas = _linhas(LinhaOrdem, (
+        _select_ordens()
+        .where(*filtros)
+        .order_by(OrdemServico.data_criacao.desc(), OrdemServico.id.desc())
+        .limit(por_pagina + 1)
+        .offset((page - 1) * por_pagina)
+    ))
+    return Pagina(linhas[:por_pagina], page, len(linhas) > por_pagina)
+
+
+def totais_por_status(*filtros, ordem=OrdemServico, item=ItemOS):
+    """{status: TotalStatus} das ordens que atendem aos filtros, agrupado no banco.
+
+    ordem/item permitem somar também as tabelas de arquivo.
+    """
+    subtotais = subtotais_por_os(item)
+    consulta = (
+        select(
+            ordem.status,
+            func.count(),
+            func.sum(func.coalesce(subtotais.c.subtotal, 0) - func.coalesce(ordem.desconto, 0)),
+        )
+        .outerjoin(subtotais, subtotais.c.os_id == ordem.id)
+        .group_by(ordem.status)
+    )
+    if filtros:
+        consulta = consulta.join(Cliente, Cliente.id == ordem.cliente_id).where(*filtros)
+    return {
+        status: TotalStatus(quantidade, valor or 0)
+        for status, quantidade, valor in db.session.execute(consulta)
+    }
+
+
+def somar_totais(*parciais):
+    """Junta resultados de totais_por_status (ex.: tabelas quentes + arquivo)."""
+    totais = {}
+    for parcial in parciais:
+        for status, (quantidade, valor) in parcial.items():
+            atual = totais.get(status, TotalStatus(0, 0))
+            totais[status] = TotalStatus(atual.quantidade + quantidade, atual.valor + valor)
+    return totais
+
+
+def ordens_com_status(status):
+    # Igualdade exata: usa ix_ordens_servico_status_data (e o índice parcial das em aberto)
+    return _linhas(LinhaOrdem, (
+        _select_ordens()
+        .where(OrdemServico.status == status)
+        .order_by(OrdemServico.data_criacao.desc())
+    ))
+
+
+def ordens_em_aberto(limite=100):
+    # Fila de trabalho, das mais antigas para as mais novas. O IN vai com
+    # valores literais: com parâmetros o planejador não casa o filtro com o do
+    # índice parcial ix_ordens_servico_em_aberto.
+    em_aberto = bindparam('em_aberto', STATUS_EM_ABERTO, expanding=True, literal_execute=True)
+    return _linhas(LinhaOrdem, (
+        _select_ordens()
+        .where(OrdemServico.status.in_(em_aberto))
+        .order_by(OrdemServico.data_criacao, OrdemServico.id)
+        .limit(limite)
+    ))
+
+
+def clientes_atendidos(inicio, fim, modelos=(OrdemServico,)):
+    """Clientes distintos com OS no período, somando as tabelas de modelos."""
+    clientes = union(*(
+        select(modelo.cliente_id).where(modelo.data_criacao >= inicio, modelo.data_criacao < fim)
+        for modelo in modelos
+    )).subquery()
+    return db.session.execute(select(func.count()).select_from(clientes)).scalar_one()
+
+
+def ultimas_ordens(desde, limite=4):
+    return _linhas(LinhaOrdem, (
+        _select_ordens()
+        .where(OrdemServico.data_criacao >= desde)
+        .order_by(OrdemServico.data_criacao.desc())
+        .limit(limite)
+    ))
+
+
+# 👥 Clientes
+def listar_clientes(termo=''):
+    consulta = select(
+        Cliente.id, Cliente.nome, Cliente.telefone, Cliente.email, Cliente.cpf_cnpj, Cliente.cidade,
+    )
+    if termo:
+        consulta = consulta.where(or_(
+            Cliente.nome.ilike(f'%{termo}%'),
+            Cliente.cpf_cnpj.ilike(f'%{termo}%'),
+            Cliente.email.ilike(f'%{termo}%'),
+        ))
+    return _linhas(LinhaCliente, consulta.order_by(Cliente.nome))
+
+
+def contar(modelo):
+    return db.session.execute(select(func.count()).select_from(modelo)).scalar_one()
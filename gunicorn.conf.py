@@ -1,7 +1,38 @@
-bind = "0.0.0.0:8000"
-workers = 3
-threads = 2
-timeout = 120
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# ⚠️ config.py lê as mesmas variáveis para dimensionar o pool do banco
+workers = int(os.getenv("WEB_CONCURRENCY", "3"))
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+# "sync" com threads > 1 vira gthread automaticamente; benchmarks/carga.py compara as opções
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
 loglevel = "info"
 accesslog = "-"
 errorlog = "-"
+
+# 🧠 Com preload o app é importado uma vez no master e os workers herdam a
+# memória via copy-on-write (boot mais rápido, menos RAM por worker).
+preload_app = os.getenv("GUNICORN_PRELOAD", "").lower() in ("1", "true", "sim", "yes", "on")
+
+
+def on_starting(server):
+    # Com preload, vale carregar a pilha de PDF no master para ser compartilhada
+    if server.cfg.preload_app and os.getenv("GUNICORN_PRELOAD_PDF", "1") != "0":
+        import xhtml2pdf.pisa  # noqa: F401
+
+    # Templates compilados no master também são herdados pelos workers
+    if server.cfg.preload_app:
+        from app import app
+        from cache_templates import precompilar_templates
+
+        precompilar_templates(app)
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master não podem ser compartilhadas entre processos
+    if server.cfg.preload_app:
+        from app import app, db
+
+        with app.app_context():
+            db.engine.dispose(close=False)
@@ -0,0 +1,175 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import Column, MetaData, String, Table, create_engine, func, insert, inspect, select, text
+
+from config import normalizar_url, opcoes_engine
+from models import db
+
+# 🔁 Ordem respeita as chaves estrangeiras (pais antes dos filhos)
+TABELAS = [
+    'empresa', 'usuarios', 'clientes', 'produtos', 'servicos', 'ordens_servico', 'itens_os',
+    'ordens_servico_arquivo', 'itens_os_arquivo',
+]
+
+
+def _contar(conn, tabela):
+    return conn.execute(select(func.count()).select_from(tabela)).scalar_one()
+
+
+def revisao_atual():
+    from alembic.script import ScriptDirectory
+
+    config = current_app.extensions['migrate'].migrate.get_config()
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def _copiar_versao_alembic(origem, destino, log):
+    # Leva junto a revisão do Flask-Migrate, para o destino não tentar
+    # reaplicar migrações que o esquema já contém. Origem sem revisão: o
+    # destino foi criado com o esquema dos modelos atuais, então vale a última.
+    linhas = []
+    if inspect(origem).has_table('alembic_version'):
+        versao = Table('alembic_version', MetaData(), autoload_with=origem)
+        with origem.connect() as conn:
+            linhas = [dict(l._mapping) for l in conn.execute(select(versao))]
+    else:
+        versao = Table('alembic_version', MetaData(), Column('version_num', String(32), primary_key=True))
+    if not linhas:
+        linhas = [{'version_num': revisao_atual()}]
+        log(f"🏷️  Origem sem revisão do Flask-Migrate: destino carimbado em {linhas[0]['version_num']}")
+    versao.create(destino, checkfirst=True)
+    with destino.begin() as conn:
+        conn.execute(versao.delete())
+        conn.execute(insert(versao), linhas)
+
+
+def _ajustar_sequencias(destino, tabelas):
+    # No Postgres o SERIAL não acompanha ids inseridos explicitamente
+    if destino.dialect.name != 'postgresql':
+        return
+    with destino.begin() as conn:
+        for tabela in tabelas:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{tabela.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {tabela.name}), 0) + 1, false)"
+            ))
+
+
+def copiar_banco(url_origem, url_destino, lote=1000, substituir=False, log=print):
+    origem = create_engine(url_origem, **opcoes_engine(url_origem))
+    destino = create_engine(url_destino, **opcoes_engine(url_destino))
+    tabelas = [db.metadata.tables[nome] for nome in TABELAS]
+
+    try:
+        db.metadata.create_all(destino, tables=tabelas)
+
+        with destino.connect() as conn:
+            ocupadas = [t.name for t in tabelas if _contar(conn, t)]
+        if ocupadas and not substituir:
+            raise click.ClickException(
+                f"Destino já possui dados em: {', '.join(ocupadas)}. Use --substituir para apagá-los."
+            )
+        if ocupadas:
+            with destino.begin() as conn:
+                for tabela in reversed(tabelas):
+                    conn.execute(tabela.delete())
+
+        resumo = []
+        for tabela in tabelas:
+            inicio = time.perf_counter()
+            copiadas = 0
+            with origem.connect() as leitura:
+                resultado = leitura.execution_options(stream_results=True, yield_per=lote).execute(
+                    select(tabela).order_by(tabela.c.id)
+                )
+                # Cada lote é gravado em uma transação própria
+                for parte in resultado.partitions():
+                    with destino.begin() as escrita:
+                        escrita.execute(insert(tabela), [dict(l._mapping) for l in parte])
+                    copiadas += len(parte)
+
+            with origem.connect() as conn:
+                total_origem = _contar(conn, tabela)
+            with destino.connect() as conn:
+                total_destino = _contar(conn, tabela)
+            if total_origem != total_destino:
+                raise click.ClickException(
+                    f"{tabela.name}: contagem divergente (origem {total_origem}, destino {total_destino})"
+                )
+
+            duracao = time.perf_counter() - inicio
+            log(f"✅ {tabela.name}: {copiadas} linhas em {duracao:.2f}s")
+            resumo.append((tabela.name, total_destino))
+
+        _ajustar_sequencias(destino, tabelas)
+        _copiar_versao_alembic(origem, destino, log)
+        return resumo
+    finally:
+        origem.dispose()
+        destino.dispose()
+
+
+# 🚚 flask copiar-banco postgresql://... sqlite:///instance/orcamento.db
+@click.command('copiar-banco')
+@click.argument('url_origem')
+@click.argument('url_destino')
+@click.option('--lote', default=1000, show_default=True, help='Linhas por transação.')
+@click.option('--substituir', is_flag=True, help='Apaga os dados existentes no destino antes de copiar.')
+@with_appcontext
+def copiar_banco_cmd(url_origem, url_destino, lote, substituir):
+    """Copia todas as tabelas entre dois bancos (ex.: Postgres → SQLite) e confere as contagens."""
+    resumo = copiar_banco(normalizar_url(url_origem), normalizar_url(url_destino), lote=lote, substituir=substituir, log=click.echo)
+    click.echo(f"Cópia concluída: {sum(n for _, n in resumo)} linhas em {len(resumo)} tabelas.")
+
+
+# 🧱 Banco novo: cria as tabelas e marca a última migração como aplicada
+@click.command('criar-tabelas')
+@with_appcontext
+def criar_tabelas_cmd():
+    """Cria as tabelas que ainda não existem e carimba a revisão atual do Flask-Migrate."""
+    from flask_migrate import stamp
+
+    db.create_all()
+    stamp()
+    click.echo("Tabelas criadas.")
+
+
+# Primeira revisão do histórico: só adiciona clientes.cidade
+REVISAO_BASE = '5e2781b8e902'
+
+
+def _sem_revisao(conn):
+    if not inspect(conn).has_table('alembic_version'):
+        return True
+    return conn.execute(text('SELECT COUNT(*) FROM alembic_version')).scalar_one() == 0
+
+
+# 🚀 Deploy: banco vazio ganha as tabelas (e o carimbo da revisão atual); banco
+# existente recebe as migrações pendentes. O histórico não tem revisão inicial,
+# então "flask db upgrade" sozinho não serve para um banco novo.
+@click.command('preparar-banco')
+@with_appcontext
+def preparar_banco_cmd():
+    """Cria as tabelas num banco vazio ou aplica as migrações pendentes (flask db upgrade)."""
+    from flask_migrate import stamp, upgrade
+
+    inspetor = inspect(db.engine)
+    if not inspetor.get_table_names():
+        db.create_all()
+        stamp()
+        click.echo("Banco novo: tabelas criadas.")
+        return
+
+    # Banco anterior ao Flask-Migrate (criado pelo antigo db.create_all() na
+    # importação): se já tem clientes.cidade, está na revisão base — carimba
+    # para o upgrade não reaplicá-la. Sem a coluna, o upgrade parte do zero.
+    with db.engine.connect() as conn:
+        sem_revisao = _sem_revisao(conn)
+    if sem_revisao and 'cidade' in {c['name'] for c in inspetor.get_columns('clientes')}:
+        stamp(revision=REVISAO_BASE)
+        click.echo(f"Banco sem revisão do Flask-Migrate: carimbado na revisão base {REVISAO_BASE}.")
+    upgrade()
+    click.echo("Migrações aplicadas.")
@@ -97,14 +97,31 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        sqlite = connection.dialect.name == 'sqlite'
+        if sqlite:
+            # 🔗 O batch mode do SQLite recria tabelas (copia, DROP, renomeia);
+            # com o foreign_keys=ON do config.py o DROP de uma tabela
+            # referenciada falha. O PRAGMA só vale fora de transação, então vai
+            # direto na conexão DBAPI, antes do BEGIN.
+            connection.connection.dbapi_connection.execute('PRAGMA foreign_keys=OFF')
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
             **conf_args
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+                if sqlite:
+                    # Sem a checagem automática, confere as referências no fim
+                    violacoes = connection.exec_driver_sql('PRAGMA foreign_key_check').fetchall()
+                    if violacoes:
+                        raise RuntimeError(f'Migração deixou chaves estrangeiras inválidas: {violacoes[:10]}')
+        finally:
+            if sqlite:
+                connection.connection.dbapi_connection.execute('PRAGMA foreign_keys=ON')
 
 
 if context.is_offline_mode():
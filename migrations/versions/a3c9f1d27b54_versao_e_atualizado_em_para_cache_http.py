@@ -0,0 +1,36 @@
+"""Versão e atualizado_em para cache HTTP (ETag / Last-Modified)
+
+Revision ID: a3c9f1d27b54
+Revises: 5e2781b8e902
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9f1d27b54'
+down_revision = '5e2781b8e902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=True))
+
+    for tabela in ('clientes', 'produtos', 'empresa'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=True))
+
+
+def downgrade():
+    for tabela in ('empresa', 'produtos', 'clientes'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_column('atualizado_em')
+
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.drop_column('atualizado_em')
+        batch_op.drop_column('versao')
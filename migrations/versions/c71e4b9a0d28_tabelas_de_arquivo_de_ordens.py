@@ -0,0 +1,59 @@
+"""Tabelas de arquivo para OS encerradas antigas
+
+Revision ID: c71e4b9a0d28
+Revises: a3c9f1d27b54
+Create Date: 2026-10-19 14:03:51.527310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71e4b9a0d28'
+down_revision = 'a3c9f1d27b54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ordens_servico_arquivo',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('data_criacao', sa.DateTime(), nullable=True),
+    sa.Column('desconto', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('versao', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.Column('arquivado_em', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ordens_servico_arquivo', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ordens_servico_arquivo_cliente_id'), ['cliente_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ordens_servico_arquivo_data_criacao'), ['data_criacao'], unique=False)
+
+    op.create_table('itens_os_arquivo',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('os_id', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Integer(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['os_id'], ['ordens_servico_arquivo.id'], ),
+    sa.ForeignKeyConstraint(['produto_id'], ['produtos.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('itens_os_arquivo', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_itens_os_arquivo_os_id'), ['os_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('itens_os_arquivo', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_itens_os_arquivo_os_id'))
+
+    op.drop_table('itens_os_arquivo')
+    with op.batch_alter_table('ordens_servico_arquivo', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ordens_servico_arquivo_data_criacao'))
+        batch_op.drop_index(batch_op.f('ix_ordens_servico_arquivo_cliente_id'))
+
+    op.drop_table('ordens_servico_arquivo')
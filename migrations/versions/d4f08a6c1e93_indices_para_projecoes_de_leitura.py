@@ -0,0 +1,31 @@
+"""Índices para as projeções de leitura (itens por OS, ordenação por data)
+
+Revision ID: d4f08a6c1e93
+Revises: c71e4b9a0d28
+Create Date: 2026-10-19 17:58:12.604418
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f08a6c1e93'
+down_revision = 'c71e4b9a0d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('itens_os', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_itens_os_os_id'), ['os_id'], unique=False)
+
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ordens_servico_data_criacao'), ['data_criacao'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ordens_servico_data_criacao'))
+
+    with op.batch_alter_table('itens_os', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_itens_os_os_id'))
@@ -0,0 +1,103 @@
+"""Status das ordens normalizado: grafia única, CHECK e índices por status
+
+Revision ID: e8b52d0f7a31
+Revises: d4f08a6c1e93
+Create Date: 2026-10-19 19:04:37.218560
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b52d0f7a31'
+down_revision = 'd4f08a6c1e93'
+branch_labels = None
+depends_on = None
+
+# Cópia congelada de models.STATUS_OS / normalizar_status: a migração não
+# pode mudar quando o modelo mudar. Só estas grafias (comparadas sem
+# maiúsculas/minúsculas e espaços extras) são convertidas; qualquer outro
+# valor, inclusive vazio ou NULL, interrompe a migração — corrija à mão
+# (UPDATE ordens_servico SET status = ... WHERE status = ...) e rode de novo.
+STATUS = ('Aberta', 'Em andamento', 'Finalizada', 'Cancelada', 'Pago')
+EM_ABERTO = ('Aberta', 'Em andamento')
+GRAFIAS = {
+    **{s.lower(): s for s in STATUS},
+    'aberto': 'Aberta',
+    'em_andamento': 'Em andamento', 'em-andamento': 'Em andamento', 'andamento': 'Em andamento',
+    'finalizado': 'Finalizada', 'concluída': 'Finalizada', 'concluida': 'Finalizada',
+    'cancelado': 'Cancelada',
+    'paga': 'Pago',
+}
+TABELAS = ('ordens_servico', 'ordens_servico_arquivo')
+
+
+def _em(valores):
+    return ', '.join(f"'{v}'" for v in valores)
+
+
+def _oficial(grafia):
+    return GRAFIAS.get(' '.join(grafia.split()).lower()) if grafia is not None else None
+
+
+def _grafias(tabela):
+    ordens = sa.table(tabela, sa.column('status', sa.String))
+    return ordens, op.get_bind().execute(sa.select(ordens.c.status).distinct()).scalars().all()
+
+
+def _normalizar():
+    # Confere tudo antes de gravar qualquer coisa
+    desconhecidos = [
+        f'{tabela}: {grafia!r}'
+        for tabela in TABELAS
+        for grafia in _grafias(tabela)[1]
+        if _oficial(grafia) is None
+    ]
+    if desconhecidos:
+        raise RuntimeError(
+            'Status sem grafia conhecida; corrija-os antes de migrar: ' + ', '.join(desconhecidos)
+        )
+
+    for tabela in TABELAS:
+        ordens, grafias = _grafias(tabela)
+        for grafia in grafias:
+            oficial = _oficial(grafia)
+            if grafia != oficial:
+                op.get_bind().execute(
+                    ordens.update().where(ordens.c.status == grafia).values(status=oficial)
+                )
+
+
+def upgrade():
+    _normalizar()
+
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.alter_column('status',
+               existing_type=sa.String(length=50),
+               nullable=False,
+               server_default='Aberta')
+        batch_op.create_check_constraint('ck_ordens_servico_status', f'status IN ({_em(STATUS)})')
+        batch_op.create_index('ix_ordens_servico_status_data', ['status', 'data_criacao'], unique=False)
+
+    # Índice parcial: só as OS em aberto, o conjunto que o dia a dia consulta
+    op.create_index(
+        'ix_ordens_servico_em_aberto', 'ordens_servico', ['data_criacao'], unique=False,
+        postgresql_where=sa.text(f'status IN ({_em(EM_ABERTO)})'),
+        sqlite_where=sa.text(f'status IN ({_em(EM_ABERTO)})'),
+    )
+    # Sem estatísticas o SQLite ignora o índice parcial e ordena em memória
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('ANALYZE ordens_servico')
+
+
+def downgrade():
+    op.drop_index('ix_ordens_servico_em_aberto', table_name='ordens_servico')
+
+    with op.batch_alter_table('ordens_servico', schema=None) as batch_op:
+        batch_op.drop_index('ix_ordens_servico_status_data')
+        batch_op.drop_constraint('ck_ordens_servico_status', type_='check')
+        batch_op.alter_column('status',
+               existing_type=sa.String(length=50),
+               nullable=True,
+               server_default=None)
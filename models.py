@@ -1,7 +1,43 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from itertools import chain
 
-db = SQLAlchemy()
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from replica import SessaoRoteada
+
+# Sessão que manda as views @somente_leitura para a réplica (ver replica.py)
+db = SQLAlchemy(session_options={'class_': SessaoRoteada})
+
+# 🚦 Status da OS: gravados sempre com esta grafia (CHECK no banco), para os
+# filtros serem igualdade simples e usarem os índices.
+STATUS_ABERTA = 'Aberta'
+STATUS_EM_ANDAMENTO = 'Em andamento'
+STATUS_FINALIZADA = 'Finalizada'
+STATUS_CANCELADA = 'Cancelada'
+STATUS_PAGO = 'Pago'
+STATUS_OS = (STATUS_ABERTA, STATUS_EM_ANDAMENTO, STATUS_FINALIZADA, STATUS_CANCELADA, STATUS_PAGO)
+# Conjunto de trabalho do dia a dia (índice parcial)
+STATUS_EM_ABERTO = (STATUS_ABERTA, STATUS_EM_ANDAMENTO)
+
+_GRAFIAS_STATUS = {
+    **{s.lower(): s for s in STATUS_OS},
+    'aberto': STATUS_ABERTA,
+    'em_andamento': STATUS_EM_ANDAMENTO, 'em-andamento': STATUS_EM_ANDAMENTO, 'andamento': STATUS_EM_ANDAMENTO,
+    'finalizado': STATUS_FINALIZADA, 'concluída': STATUS_FINALIZADA, 'concluida': STATUS_FINALIZADA,
+    'cancelado': STATUS_CANCELADA,
+    'paga': STATUS_PAGO,
+}
+
+
+def normalizar_status(valor):
+    """Grafia oficial de um status digitado de qualquer jeito, ou None se não for reconhecido."""
+    return _GRAFIAS_STATUS.get(' '.join((valor or '').split()).lower())
+
+
+def _em(valores):
+    return ', '.join(f"'{v}'" for v in valores)
 
 # seus modelos aqui...
 
@@ -13,6 +49,7 @@ class Cliente(db.Model):
     email = db.Column(db.String(100))
     cpf_cnpj = db.Column(db.String(20), unique=True, nullable=False)
     cidade = db.Column(db.String(100))
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=db.func.now())
 
     ordens = db.relationship('OrdemServico', backref='cliente', cascade='all, delete-orphan')
 
@@ -27,6 +64,7 @@ class Produto(db.Model):
     descricao = db.Column(db.String(200))
     preco = db.Column(db.Float, nullable=False)
     tipo = db.Column(db.String(20), nullable=False)  # Produto ou Serviço
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=db.func.now())
 
     itens_os = db.relationship('ItemOS', backref='produto', cascade='all, delete-orphan')
 
@@ -50,12 +88,27 @@ class OrdemServico(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id'), nullable=False)
     observacoes = db.Column(db.Text)
-    data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
+    data_criacao = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     desconto = db.Column(db.Float, default=0.0)
-    status = db.Column(db.String(50), default='Aberta')
+    status = db.Column(db.String(50), nullable=False, default=STATUS_ABERTA, server_default=STATUS_ABERTA)
+    # 🏷️ Incrementados a cada alteração da OS ou de seus itens (ETag / Last-Modified)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
 
     itens_os = db.relationship('ItemOS', backref='ordem', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.CheckConstraint(f'status IN ({_em(STATUS_OS)})', name='ck_ordens_servico_status'),
+        db.Index('ix_ordens_servico_status_data', 'status', 'data_criacao'),
+        db.Index(
+            'ix_ordens_servico_em_aberto', 'data_criacao',
+            postgresql_where=db.text(f'status IN ({_em(STATUS_EM_ABERTO)})'),
+            sqlite_where=db.text(f'status IN ({_em(STATUS_EM_ABERTO)})'),
+        ),
+    )
+
+    arquivada = False
+
     @property
     def total(self):
         return sum(
@@ -71,7 +124,7 @@ class OrdemServico(db.Model):
 class ItemOS(db.Model):
     __tablename__ = 'itens_os'
     id = db.Column(db.Integer, primary_key=True)
-    os_id = db.Column(db.Integer, db.ForeignKey('ordens_servico.id'), nullable=False)
+    os_id = db.Column(db.Integer, db.ForeignKey('ordens_servico.id'), nullable=False, index=True)
     produto_id = db.Column(db.Integer, db.ForeignKey('produtos.id'), nullable=False)
     quantidade = db.Column(db.Integer, nullable=False)
 
@@ -79,6 +132,50 @@ class ItemOS(db.Model):
         return f"<ItemOS {self.id} - OS {self.os_id} - Produto {self.produto_id}>"
 
 
+# 🗄️ Arquivo: OS pagas/canceladas antigas saem das tabelas quentes e vêm para
+# cá com o mesmo id (ver arquivo.py). Somente leitura.
+class OrdemServicoArquivo(db.Model):
+    __tablename__ = 'ordens_servico_arquivo'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id'), nullable=False, index=True)
+    observacoes = db.Column(db.Text)
+    data_criacao = db.Column(db.DateTime, index=True)
+    desconto = db.Column(db.Float, default=0.0)
+    status = db.Column(db.String(50))
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    atualizado_em = db.Column(db.DateTime)
+    arquivado_em = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
+
+    cliente = db.relationship('Cliente')
+    itens_os = db.relationship('ItemOSArquivo', backref='ordem', order_by='ItemOSArquivo.id')
+
+    arquivada = True
+
+    @property
+    def total(self):
+        return sum(
+            item.quantidade * item.produto.preco
+            for item in self.itens_os
+            if item.produto
+        ) - (self.desconto or 0)
+
+    def __repr__(self):
+        return f"<OS arquivada {self.id} - Cliente {self.cliente_id}>"
+
+
+class ItemOSArquivo(db.Model):
+    __tablename__ = 'itens_os_arquivo'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    os_id = db.Column(db.Integer, db.ForeignKey('ordens_servico_arquivo.id'), nullable=False, index=True)
+    produto_id = db.Column(db.Integer, db.ForeignKey('produtos.id'), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False)
+
+    produto = db.relationship('Produto')
+
+    def __repr__(self):
+        return f"<ItemOS arquivado {self.id} - OS {self.os_id} - Produto {self.produto_id}>"
+
+
 class Usuario(db.Model):
     __tablename__ = 'usuarios'
     id = db.Column(db.Integer, primary_key=True)
@@ -99,6 +196,42 @@ class Empresa(db.Model):
     cnpj = db.Column(db.String(20), unique=True)
     observacoes = db.Column(db.Text)
     site = db.Column(db.String(100))
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=db.func.now())
 
     def __repr__(self):
         return f"<Empresa {self.id} - {self.nome}>"
+
+
+# 🏷️ Versionamento das ordens: qualquer mudança na OS ou em um de seus itens
+# avança versao/atualizado_em da OS antes do flush.
+def marcar_ordens_alteradas(ids):
+    """Para escritas em massa (fora do ORM), que não passam pelo before_flush."""
+    if ids:
+        db.session.execute(
+            update(OrdemServico)
+            .where(OrdemServico.id.in_(ids))
+            .values(versao=OrdemServico.versao + 1, atualizado_em=datetime.utcnow())
+        )
+
+
+@event.listens_for(Session, 'before_flush')
+def _versionar_ordens(session, flush_context, instances):
+    agora = datetime.utcnow()
+    ordens = set()
+    for obj in session.dirty:
+        if isinstance(obj, OrdemServico) and session.is_modified(obj):
+            ordens.add(obj)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, ItemOS) or obj.os_id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        with session.no_autoflush:
+            ordem = session.get(OrdemServico, obj.os_id)
+        if ordem is not None and ordem not in session.new:
+            ordens.add(ordem)
+    for ordem in ordens:
+        if ordem in session.deleted:
+            continue
+        ordem.versao = (ordem.versao or 0) + 1
+        ordem.atualizado_em = agora
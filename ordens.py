@@ -0,0 +1,100 @@
+from sqlalchemy import case, delete, func, insert, select, update
+
+from models import db, ItemOS, ItemOSArquivo, Produto, marcar_ordens_alteradas
+
+
+class ProdutoInexistente(ValueError):
+    def __init__(self, ids):
+        self.ids = sorted(ids)
+        super().__init__(f"Produto(s) inexistente(s): {', '.join(map(str, self.ids))}")
+
+
+def ler_itens(produto_ids, quantidades):
+    """Converte as listas do formulário em pares (produto_id, quantidade), ignorando linhas inválidas."""
+    itens = []
+    for pid, qtd in zip(produto_ids, quantidades):
+        try:
+            pid, qtd = int(pid), int(qtd)
+        except (ValueError, TypeError):
+            continue
+        if qtd > 0:
+            itens.append((pid, qtd))
+    return itens
+
+
+def ler_quantidades(form):
+    """Campos quantidade_<item_id> do formulário de edição, ignorando quantidades inválidas ou <= 0."""
+    quantidades = {}
+    for campo, valor in form.items():
+        if not campo.startswith('quantidade_') or not valor:
+            continue
+        try:
+            item_id, qtd = int(campo[len('quantidade_'):]), int(valor)
+        except ValueError:
+            continue
+        if qtd > 0:
+            quantidades[item_id] = qtd
+    return quantidades
+
+
+# 🧾 Sincroniza os itens de uma OS com um número fixo de comandos, não importa
+# quantas linhas: 1 SELECT valida os produtos, 1 SELECT lê os itens atuais e
+# no máximo 1 INSERT, 1 UPDATE (CASE por id), 1 DELETE e 1 UPDATE da versão.
+# Não faz commit: tudo entra na transação de quem chamou.
+def sincronizar_itens(os_id, novos=(), quantidades=None, excluir=()):
+    # Nenhuma linha com quantidade <= 0 chega ao banco, venha de onde vier
+    novos = [(pid, qtd) for pid, qtd in novos if qtd > 0]
+    quantidades = {item_id: qtd for item_id, qtd in (quantidades or {}).items() if qtd > 0}
+    excluir = set(excluir)
+
+    if novos:
+        pedidos = {pid for pid, _ in novos}
+        existentes = set(db.session.scalars(select(Produto.id).where(Produto.id.in_(pedidos))))
+        if pedidos - existentes:
+            raise ProdutoInexistente(pedidos - existentes)
+
+    atuais = {}
+    if quantidades or excluir:
+        atuais = dict(db.session.execute(
+            select(ItemOS.id, ItemOS.quantidade).where(ItemOS.os_id == os_id)
+        ).all())
+
+    excluir &= atuais.keys()
+    alterar = {
+        item_id: qtd for item_id, qtd in quantidades.items()
+        if item_id in atuais and item_id not in excluir and atuais[item_id] != qtd
+    }
+
+    if novos:
+        db.session.execute(insert(ItemOS).values([
+            {'os_id': os_id, 'produto_id': pid, 'quantidade': qtd} for pid, qtd in novos
+        ]))
+    if alterar:
+        db.session.execute(
+            update(ItemOS)
+            .where(ItemOS.os_id == os_id, ItemOS.id.in_(alterar))
+            .values(quantidade=case(alterar, value=ItemOS.id))
+            .execution_options(synchronize_session=False)
+        )
+    if excluir:
+        db.session.execute(
+            delete(ItemOS)
+            .where(ItemOS.os_id == os_id, ItemOS.id.in_(excluir))
+            .execution_options(synchronize_session=False)
+        )
+
+    alterou = bool(novos or alterar or excluir)
+    if alterou:
+        # Escritas em massa não passam pelo before_flush que versiona a OS
+        marcar_ordens_alteradas([os_id])
+    return alterou
+
+
+def subtotal_os(ordem):
+    """Soma dos itens calculada no banco, sem carregar itens e produtos (OS viva ou arquivada)."""
+    item = ItemOSArquivo if ordem.arquivada else ItemOS
+    return db.session.execute(
+        select(func.coalesce(func.sum(item.quantidade * func.coalesce(Produto.preco, 0)), 0))
+        .join(Produto, Produto.id == item.produto_id)
+        .where(item.os_id == ordem.id)
+    ).scalar_one()
@@ -0,0 +1,75 @@
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session as SessaoFlask
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import env_int
+
+# 📖 Réplica de leitura: com DATABASE_REPLICA_URL definida, as views marcadas
+# com @somente_leitura consultam a réplica; o resto (e toda escrita) fica no
+# primário. Para testar localmente, dois arquivos SQLite fazem o papel dos dois:
+#   DB_PROFILE=sqlite flask copiar-banco sqlite:///instance/orcamento.db sqlite:///instance/replica.db --substituir
+#   DB_PROFILE=sqlite DATABASE_REPLICA_URL=sqlite:///instance/replica.db flask run
+
+# Depois de uma escrita, o usuário lê do primário por este tempo — cobre o
+# atraso da replicação e garante que ele veja a própria alteração.
+JANELA_PRIMARIO_S = env_int('DB_REPLICA_JANELA_S', 10)
+BIND_REPLICA = 'replica'
+
+
+class SessaoRoteada(SessaoFlask):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and has_request_context()
+            and g.get('usar_replica')
+            and not self._flushing
+            and not getattr(clause, 'is_dml', False)
+        ):
+            return self._db.engines[BIND_REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_configurada():
+    return BIND_REPLICA in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def escreveu_recentemente():
+    return time.time() - session.get('escrita_em', 0) < JANELA_PRIMARIO_S
+
+
+# 🏷️ Marca a view como só-leitura: vai para a réplica, a menos que o usuário
+# tenha acabado de gravar algo
+def somente_leitura(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if replica_configurada() and not escreveu_recentemente():
+            g.usar_replica = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+# ✍️ Lembra, na sessão do usuário, quando ele gravou pela última vez
+@event.listens_for(Session, 'after_flush')
+def _flush_com_escrita(sessao, flush_context):
+    sessao.info['escrita'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _execucao_com_escrita(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        estado.session.info['escrita'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _registrar_escrita(sessao):
+    if sessao.info.pop('escrita', False) and has_request_context():
+        session['escrita_em'] = time.time()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_escrita(sessao):
+    sessao.info.pop('escrita', None)
@@ -1,2 +1,8 @@
 #!/bin/bash
-gunicorn -c gunicorn/gunicorn.conf.py app:app
+# 🎨 Gera static/dist (hash, .gz/.br, logo do PDF); sem ele os templates caem no static/ ou no CDN
+flask --app app assets || echo "⚠️  Build dos assets falhou; servindo arquivos sem hash."
+# 📚 Bytecode dos templates pronto antes do primeiro worker subir
+flask --app app compilar-templates || echo "⚠️  Templates serão compilados sob demanda."
+# 🧱 Esquema em dia antes de subir: sem isso o app rodaria sobre tabelas antigas
+flask --app app preparar-banco || { echo "❌ Migração do banco falhou; abortando o deploy."; exit 1; }
+gunicorn -c gunicorn.conf.py app:app